@@ -5,12 +5,32 @@ from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 import tempfile
 import os
+import io
+import re
+import base64
+import aiohttp
 from gtts import gTTS
 import pygame
 
 from ..tts_interface import TTSEngineInterface
 from utils.exceptions import TTSEngineError
 
+# Google answers each batchexecute RPC with the base64 MP3 payload embedded in this frame.
+# Both this and gTTS._prepare_requests are gTTS internals (pinned in requirements.txt);
+# if either stops working, synthesis falls back to the public gTTS.write_to_fp
+_AUDIO_PATTERN = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+# The pygame mixer is process-wide; configure it once for gTTS's 24 kHz mono MP3s
+_PG_INITED = False
+
+def _init_mixer() -> None:
+    """Initialize the pygame mixer once per process."""
+    global _PG_INITED
+    if not _PG_INITED:
+        pygame.mixer.pre_init(frequency=24000, size=-16, channels=1, buffer=2048)
+        pygame.mixer.init()
+        _PG_INITED = True
+
 class GTTSEngine(TTSEngineInterface):
     """Google TTS Engine implementation"""
 
@@ -22,7 +42,82 @@ class GTTSEngine(TTSEngineInterface):
             "lang": "en",
             "slow": False
         }
-        pygame.mixer.init()
+        self._session: Optional[aiohttp.ClientSession] = None
+        _init_mixer()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16)
+            )
+        return self._session
+
+    async def _fetch_part(self, request: Any) -> Optional[bytes]:
+        """
+        Fetch the audio for a single prepared gTTS request.
+
+        Args:
+            request: Prepared request produced by gTTS for one text chunk
+
+        Returns:
+            MP3 bytes for the chunk, or None if the response format is not recognised
+        """
+        session = self._get_session()
+        async with session.post(request.url, data=request.body, headers=dict(request.headers)) as response:
+            response.raise_for_status()
+            payload = await response.text()
+
+        audio = bytearray()
+        for line in payload.splitlines():
+            match = _AUDIO_PATTERN.search(line)
+            if match:
+                audio.extend(base64.b64decode(match.group(1).encode("ascii")))
+        return bytes(audio) if audio else None
+
+    async def _synthesize(self, text: str) -> bytes:
+        """
+        Synthesize text to MP3 bytes, fetching all gTTS chunks concurrently.
+
+        Args:
+            text: Text to convert to speech
+
+        Returns:
+            Concatenated MP3 bytes in text order
+        """
+        tts = gTTS(
+            text=text,
+            lang=self._settings["lang"],
+            slow=self._settings["slow"]
+        )
+        try:
+            prepared = tts._prepare_requests()
+        except Exception:
+            prepared = None
+            
+        if prepared is not None:
+            # gather preserves input order, and MP3 frames concatenate cleanly
+            parts = await asyncio.gather(*(self._fetch_part(r) for r in prepared))
+            if all(parts):
+                return b"".join(parts)
+                
+        # gTTS internals changed: use the public, serial API instead
+        return await asyncio.to_thread(self._synthesize_public, tts)
+
+    @staticmethod
+    def _synthesize_public(tts: gTTS) -> bytes:
+        """Synthesize through gTTS's public API (blocking)."""
+        buffer = io.BytesIO()
+        tts.write_to_fp(buffer)
+        if not buffer.getvalue():
+            raise TTSEngineError("No audio content returned by Google TTS")
+        return buffer.getvalue()
+
+    async def _save(self, text: str, output_path: str) -> None:
+        """Synthesize text and write the MP3 to output_path."""
+        audio = await self._synthesize(text)
+        with open(output_path, "wb") as f:
+            f.write(audio)
 
     async def initialize(self) -> None:
         """Initialize the Google TTS engine with required resources."""
@@ -65,12 +160,7 @@ class GTTSEngine(TTSEngineInterface):
                 temp_path = temp.name
 
             # Generate speech
-            tts = gTTS(
-                text=text,
-                lang=self._settings["lang"],
-                slow=self._settings["slow"]
-            )
-            tts.save(temp_path)
+            await self._save(text, temp_path)
 
             # Play audio
             pygame.mixer.music.load(temp_path)
@@ -100,12 +190,7 @@ class GTTSEngine(TTSEngineInterface):
         """
         try:
             output_path = str(output_path)
-            tts = gTTS(
-                text=text,
-                lang=self._settings["lang"],
-                slow=self._settings["slow"]
-            )
-            tts.save(output_path)
+            await self._save(text, output_path)
             return output_path
         except Exception as e:
             raise TTSEngineError(f"Failed to save text to file: {str(e)}")
@@ -164,7 +249,11 @@ class GTTSEngine(TTSEngineInterface):
         """Clean up resources used by the engine."""
         try:
             await self.stop()
-            pygame.mixer.quit()
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+            # Leave the shared mixer running for other engine instances
+            pygame.mixer.music.stop()
         except Exception as e:
             raise TTSEngineError(f"Failed to cleanup engine: {str(e)}")
 
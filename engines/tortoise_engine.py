@@ -1,10 +1,78 @@
 import os
+import asyncio
+import threading
+import weakref
 import torch
-from typing import Dict, Optional
+import soundfile as sf
+from typing import AsyncIterator, Dict, Optional, Tuple
+import numpy as np
 from tortoise.api import TextToSpeech
+try:
+    # Streaming entry point (tts_stream), shipped with tortoise-tts 3.x
+    from tortoise.api_fast import TextToSpeech as FastTextToSpeech
+except ImportError:
+    FastTextToSpeech = None
 from tortoise.utils.audio import load_audio, load_voice, load_voices
 from .base import BaseTTSEngine
 
+# Supported values for config['precision']
+_PRECISIONS = {
+    'fp32': torch.float32,
+    'fp16': torch.float16,
+    'bf16': torch.bfloat16
+}
+
+SAMPLE_RATE = 22050
+STREAM_CHUNK_MS = 40  # size of each PCM chunk yielded by stream_synthesize
+FADE_MS = 2  # crossfade between consecutive model chunks to avoid clicks
+
+# One synthesis at a time per device; concurrent Tortoise runs on a GPU just OOM.
+# asyncio primitives belong to one event loop, so each running loop gets its own.
+_DEVICE_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+# Loaded models shared by every engine instance, keyed by (precision, device, streaming)
+_TTS_POOL: Dict[Tuple[str, str, bool], TextToSpeech] = {}
+_TTS_POOL_LOCK = threading.Lock()
+
+def _current_device() -> str:
+    """Get the name of the current torch device."""
+    return f"cuda:{torch.cuda.current_device()}" if torch.cuda.is_available() else "cpu"
+
+def _device_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore guarding the current torch device on the running event loop."""
+    semaphores = _DEVICE_SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+    device = _current_device()
+    if device not in semaphores:
+        semaphores[device] = asyncio.Semaphore(1)
+    return semaphores[device]
+
+def _crossfade(tail: np.ndarray, audio: np.ndarray) -> None:
+    """
+    Overlap the held-back tail of the previous chunk onto the head of audio
+    in place, fading the tail out while audio fades in.
+    """
+    n = min(len(tail), len(audio))
+    if n == 0:
+        return
+    ramp = np.linspace(0.0, 1.0, n, dtype=audio.dtype)
+    audio[:n] = tail[:n] * ramp[::-1] + audio[:n] * ramp
+
+def _get_tts(precision: str, streaming: bool = False) -> TextToSpeech:
+    """Get the shared (streaming or standard) Tortoise model for precision on the current device."""
+    key = (precision, _current_device(), streaming)
+    with _TTS_POOL_LOCK:
+        if key not in _TTS_POOL:
+            tts = FastTextToSpeech() if streaming else TextToSpeech()
+            # Reduced precision only pays off (and is only reliable) on CUDA
+            dtype = _PRECISIONS.get(precision, torch.float32)
+            if dtype != torch.float32 and torch.cuda.is_available():
+                for name in ('autoregressive', 'diffusion', 'clvp', 'vocoder'):
+                    module = getattr(tts, name, None)
+                    if module is not None:
+                        module.to(dtype)
+            _TTS_POOL[key] = tts
+        return _TTS_POOL[key]
+
 class TortoiseEngine(BaseTTSEngine):
     """Tortoise TTS Engine implementation."""
     
@@ -16,9 +84,15 @@ class TortoiseEngine(BaseTTSEngine):
         self.voice = config.get('voice', 'random')
         self.use_deterministic_seed = config.get('use_deterministic_seed', False)
         self.seed = config.get('seed', None)
+        self.precision = config.get('precision', 'fp32')
+        
+        # Initialize TTS, reusing weights already loaded by another engine
+        self.tts = _get_tts(self.precision)
+        self.dtype = _PRECISIONS.get(self.precision, torch.float32)
+        self.use_autocast = self.dtype != torch.float32 and torch.cuda.is_available()
         
-        # Initialize TTS
-        self.tts = TextToSpeech()
+        # Streaming model (tortoise.api_fast), loaded on the first stream_synthesize
+        self._stream_tts = None
         
         # Load voice samples if provided
         self.voice_samples = None
@@ -27,6 +101,35 @@ class TortoiseEngine(BaseTTSEngine):
         elif isinstance(self.voice, list):
             self.voice_samples = load_voices(self.voice)
 
+    def _seed(self) -> Optional[int]:
+        """
+        Value for Tortoise's use_deterministic_seed argument, which takes the
+        seed itself (None draws a fresh seed from the clock).
+        """
+        if not self.use_deterministic_seed:
+            return None
+        return self.seed if self.seed is not None else 0
+
+    def _settings(self) -> Dict:
+        """Keyword arguments shared by every Tortoise synthesis call."""
+        return dict(
+            voice_samples=self.voice_samples,
+            preset=self.preset,
+            use_deterministic_seed=self._seed()
+        )
+
+    def _generate(self, text: str) -> np.ndarray:
+        """Run Tortoise synthesis for one text (blocking)."""
+        with torch.inference_mode(), torch.autocast('cuda', dtype=self.dtype, enabled=self.use_autocast):
+            # tts() takes no preset; tts_with_preset expands it into sampler settings
+            gen_audio = self.tts.tts_with_preset(text, **self._settings())
+        return gen_audio.squeeze().float().cpu().numpy()
+
+    async def _run_single(self, text: str) -> np.ndarray:
+        """Run one text off the event loop, one synthesis per device at a time."""
+        async with _device_semaphore():
+            return await asyncio.to_thread(self._generate, text)
+
     async def synthesize(self, text: str, output_path: str, **kwargs) -> str:
         """
         Synthesize text to speech using Tortoise TTS.
@@ -40,19 +143,9 @@ class TortoiseEngine(BaseTTSEngine):
             Path to the generated audio file
         """
         try:
-            # Generate audio
-            gen_audio = self.tts.tts(
-                text=text,
-                voice_samples=self.voice_samples,
-                preset=self.preset,
-                use_deterministic_seed=self.use_deterministic_seed,
-                seed=self.seed
-            )
-            
-            # Convert to numpy array and save
-            gen_audio = gen_audio.squeeze().cpu().numpy()
-            import soundfile as sf
-            sf.write(output_path, gen_audio, 22050)
+            # Generate audio, queued behind any synthesis already running on the device
+            gen_audio = await self._run_single(text)
+            await asyncio.to_thread(sf.write, output_path, gen_audio, SAMPLE_RATE)
             
             return output_path
             
@@ -60,6 +153,71 @@ class TortoiseEngine(BaseTTSEngine):
             self.logger.error(f"Error in Tortoise synthesis: {str(e)}")
             raise
 
+    def _stream_worker(self, text: str, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue) -> None:
+        """Produce audio chunks onto queue from a worker thread (blocking)."""
+        try:
+            if self._stream_tts is None and FastTextToSpeech is not None:
+                self._stream_tts = _get_tts(self.precision, streaming=True)
+                
+            with torch.inference_mode(), torch.autocast('cuda', dtype=self.dtype, enabled=self.use_autocast):
+                if self._stream_tts is not None:
+                    # tts_stream yields vocoded audio as the autoregressive model emits tokens
+                    chunks = self._stream_tts.tts_stream(
+                        text,
+                        voice_samples=self.voice_samples,
+                        use_deterministic_seed=self._seed()
+                    )
+                else:
+                    # Without tortoise.api_fast the whole utterance arrives as one chunk
+                    chunks = [self.tts.tts_with_preset(text, **self._settings())]
+                
+                for chunk in chunks:
+                    audio = chunk.squeeze().float().cpu().numpy()
+                    loop.call_soon_threadsafe(queue.put_nowait, audio)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    async def stream_synthesize(self, text: str) -> AsyncIterator[bytes]:
+        """
+        Synthesize text and yield audio as it is generated.
+        
+        Args:
+            text: Text to synthesize
+            
+        Yields:
+            Mono float32 PCM chunks of STREAM_CHUNK_MS at SAMPLE_RATE
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        chunk_len = SAMPLE_RATE * STREAM_CHUNK_MS // 1000
+        fade_len = SAMPLE_RATE * FADE_MS // 1000
+        
+        async with _device_semaphore():
+            worker = asyncio.create_task(asyncio.to_thread(self._stream_worker, text, loop, queue))
+            try:
+                # The last fade_len samples of each model chunk are held back and
+                # crossfaded into the next chunk, or flushed after the last one
+                tail = np.zeros(0, dtype=np.float32)
+                while True:
+                    audio = await queue.get()
+                    if audio is None:
+                        break
+                    if isinstance(audio, Exception):
+                        self.logger.error(f"Error in Tortoise streaming synthesis: {str(audio)}")
+                        raise audio
+                    
+                    _crossfade(tail, audio)
+                    split = max(len(audio) - fade_len, min(len(tail), len(audio)))
+                    tail = audio[split:].copy()
+                    for start in range(0, split, chunk_len):
+                        yield audio[start:min(start + chunk_len, split)].tobytes()
+                if len(tail):
+                    yield tail.tobytes()
+            finally:
+                await worker
+
     def get_available_voices(self) -> Dict[str, str]:
         """Get list of available voices."""
         try:
@@ -72,6 +230,8 @@ class TortoiseEngine(BaseTTSEngine):
     def validate_config(self) -> bool:
         """Validate the engine configuration."""
         required_fields = ['preset']
+        if self.config.get('precision', 'fp32') not in _PRECISIONS:
+            return False
         return all(field in self.config for field in required_fields)
 
     def set_voice(self, voice: str) -> None:
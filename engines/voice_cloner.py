@@ -4,6 +4,33 @@ import librosa
 import soundfile as sf
 from typing import Tuple, List, Optional
 import os
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+def _allpole_filter_frames(frames: np.ndarray, coeffs: np.ndarray, window: np.ndarray) -> np.ndarray:
+    """
+    Filter each column of frames through its own all-pole LPC filter 1/A(z)
+    and apply the synthesis window. Frames are independent, so the outer
+    loop runs in parallel when Numba is available.
+    """
+    frame_length, n_frames = frames.shape
+    order = coeffs.shape[0] - 1
+    out = np.empty_like(frames)
+    for i in prange(n_frames):
+        for t in range(frame_length):
+            acc = frames[t, i]
+            for k in range(1, min(order, t) + 1):
+                acc -= coeffs[k, i] * out[t - k, i]
+            out[t, i] = acc / coeffs[0, i]
+        for t in range(frame_length):
+            out[t, i] *= window[t]
+    return out
+
+if njit is not None:
+    _allpole_filter_frames = njit(parallel=True, cache=True)(_allpole_filter_frames)
 
 class VoiceCloner:
     """Offline voice cloning using traditional signal processing techniques"""
@@ -14,46 +41,91 @@ class VoiceCloner:
         self.hop_length = 512
         self.n_mels = 80
         
+        # LPC analysis framing (25 ms frames, 10 ms hop) is fixed by sample_rate
+        self._frame_length = int(0.025 * self.sample_rate)
+        self._frame_step = int(0.010 * self.sample_rate)
+        self._window = np.hamming(self._frame_length).astype(np.float32)
+        
     def extract_features(self, audio_path: str) -> Tuple[np.ndarray, np.ndarray]:
         """
         Extract pitch and formant features from audio
         """
         # Load audio
-        y, sr = librosa.load(audio_path, sr=self.sample_rate)
+        y, sr = librosa.load(audio_path, sr=self.sample_rate, dtype=np.float32, res_type="soxr_hq")
         
-        # Extract pitch using YIN algorithm
-        pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+        # Extract per-frame pitch contour
+        pitches = self._pitch_track(y, sr)
         
         # Extract formants using LPC
         formants = self._extract_formants(y, sr)
         
         return pitches, formants
     
+    def _pitch_track(self, audio: np.ndarray, sr: int) -> np.ndarray:
+        """
+        Estimate a per-frame pitch contour, searching only the vocal range
+        """
+        pitches, magnitudes = librosa.piptrack(y=audio, sr=sr,
+                                               n_fft=self.n_fft,
+                                               hop_length=self.hop_length,
+                                               fmin=50.0, fmax=500.0)
+        # Pick the strongest bin in each frame
+        return pitches[np.argmax(magnitudes, axis=0), np.arange(pitches.shape[1])]
+    
     def _extract_formants(self, audio: np.ndarray, sr: int) -> np.ndarray:
         """
         Extract formants using Linear Predictive Coding (LPC)
         """
         # Pre-emphasis
-        pre_emphasis = 0.97
+        pre_emphasis = np.float32(0.97)
         emphasized_audio = np.append(audio[0], audio[1:] - pre_emphasis * audio[:-1])
         
         # Frame the signal
-        frame_length = int(0.025 * sr)
-        frame_step = int(0.010 * sr)
+        if sr == self.sample_rate:
+            frame_length, frame_step, window = self._frame_length, self._frame_step, self._window
+        else:
+            frame_length = int(0.025 * sr)
+            frame_step = int(0.010 * sr)
+            window = np.hamming(frame_length).astype(np.float32)
         frames = librosa.util.frame(emphasized_audio, frame_length=frame_length, hop_length=frame_step)
         
-        # Apply window
-        window = np.hamming(frame_length)
-        windowed_frames = frames * window[:, np.newaxis]
+        # Apply window in place on a writable contiguous copy of the strided view
+        windowed_frames = np.array(frames, dtype=np.float32, order='C')
+        np.multiply(windowed_frames, window[:, np.newaxis], out=windowed_frames)
         
-        # Calculate LPC coefficients
+        # Autocorrelation of every frame at once via one zero-padded FFT
         lpc_order = 12
-        lpc_coeffs = np.zeros((lpc_order + 1, frames.shape[1]))
+        n_fft = 1 << (2 * frame_length - 1).bit_length()
+        spectrum = np.fft.rfft(windowed_frames, n=n_fft, axis=0)
+        autocorr = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n=n_fft, axis=0)[:lpc_order + 1]
+        
+        # Calculate LPC coefficients
+        lpc_coeffs = self._levinson_durbin(autocorr, lpc_order)
         
-        for i in range(frames.shape[1]):
-            lpc_coeffs[:, i] = librosa.lpc(windowed_frames[:, i], order=lpc_order)
+        return lpc_coeffs.astype(np.float32)
+    
+    @staticmethod
+    def _levinson_durbin(autocorr: np.ndarray, order: int) -> np.ndarray:
+        """
+        Solve for LPC coefficients of all frames at once with the Levinson-Durbin
+        recursion. autocorr has shape (order + 1, n_frames).
+        """
+        n_frames = autocorr.shape[1]
+        coeffs = np.zeros((order + 1, n_frames), dtype=autocorr.dtype)
+        coeffs[0] = 1.0
+        
+        # Silent frames have zero energy; leave them with a flat (all-zero) predictor
+        error = np.where(autocorr[0] > 0, autocorr[0], 1.0)
+        
+        for i in range(1, order + 1):
+            acc = autocorr[i] + np.einsum('jn,jn->n', coeffs[1:i], autocorr[i - 1:0:-1])
+            reflection = -acc / error
+            coeffs[1:i] = coeffs[1:i] + reflection * coeffs[i - 1:0:-1]
+            coeffs[i] = reflection
+            error = error * (1.0 - reflection ** 2)
+            error = np.where(error > 0, error, 1.0)
         
-        return lpc_coeffs
+        return coeffs
     
     def clone_voice(self, source_audio: str, target_text: str, output_path: str) -> bool:
         """
@@ -73,7 +145,7 @@ class VoiceCloner:
             engine.runAndWait()
             
             # Load base speech
-            base_audio, sr = librosa.load(temp_path, sr=self.sample_rate)
+            base_audio, sr = librosa.load(temp_path, sr=self.sample_rate, dtype=np.float32, res_type="soxr_hq")
             
             # Apply voice characteristics
             modified_audio = self._apply_voice_characteristics(base_audio, pitches, formants)
@@ -98,15 +170,19 @@ class VoiceCloner:
         """
         Apply voice characteristics from source to base audio
         """
-        # Resample pitches to match base audio length
-        target_length = len(base_audio)
-        pitches_resampled = signal.resample(pitches, target_length)
+        # Shift by the interval between the voiced median pitches
+        base_pitches = self._pitch_track(base_audio, self.sample_rate)
+        source_voiced = pitches[pitches > 0]
+        base_voiced = base_pitches[base_pitches > 0]
+        n_steps = 0.0
+        if len(source_voiced) and len(base_voiced):
+            n_steps = 12 * np.log2(np.median(source_voiced) / np.median(base_voiced))
         
         # Apply pitch modification
         modified_audio = librosa.effects.pitch_shift(
             base_audio,
             sr=self.sample_rate,
-            n_steps=np.mean(pitches_resampled)
+            n_steps=n_steps
         )
         
         # Apply formant modification
@@ -118,16 +194,41 @@ class VoiceCloner:
                                   audio: np.ndarray, 
                                   formants: np.ndarray) -> np.ndarray:
         """
-        Apply formant modification using LPC analysis/synthesis
+        Apply formant modification using LPC analysis/synthesis.
+        
+        Each frame of the base audio is filtered through the time-aligned
+        source frame's LPC envelope and the results are overlap-added.
         """
-        # Calculate LPC coefficients for base audio
-        lpc_order = 12
-        lpc_coeffs = librosa.lpc(audio, order=lpc_order)
+        audio = np.asarray(audio, dtype=np.float32)
+        n_samples = len(audio)
+        frame_length, hop = self._frame_length, self._frame_step
+        
+        # Pad so the last frame reaches the end of the signal
+        n_frames = 1 + max(0, int(np.ceil((n_samples - frame_length) / hop)))
+        padded = np.zeros(frame_length + (n_frames - 1) * hop, dtype=np.float32)
+        padded[:n_samples] = audio
+        frames = np.array(librosa.util.frame(padded, frame_length=frame_length, hop_length=hop),
+                          dtype=np.float32, order='C')
+        
+        # Map every base frame to the source frame at the same relative position
+        source_idx = np.minimum(np.arange(n_frames) * formants.shape[1] // n_frames,
+                                formants.shape[1] - 1)
+        coeffs = np.ascontiguousarray(formants[:, source_idx], dtype=np.float32)
         
-        # Modify LPC coefficients based on target formants
-        modified_coeffs = np.mean(formants, axis=1)
+        window = np.hanning(frame_length).astype(np.float32)
+        if njit is not None:
+            filtered = _allpole_filter_frames(frames, coeffs, window)
+        else:
+            filtered = np.empty_like(frames)
+            for i in range(n_frames):
+                filtered[:, i] = signal.lfilter([1], coeffs[:, i], frames[:, i]) * window
         
-        # Apply modified coefficients
-        modified_audio = signal.lfilter([1], modified_coeffs, audio)
+        # Overlap-add, normalising by the summed window envelope
+        positions = np.arange(frame_length)[:, np.newaxis] + hop * np.arange(n_frames)
+        output = np.zeros(len(padded), dtype=np.float32)
+        envelope = np.zeros(len(padded), dtype=np.float32)
+        np.add.at(output, positions, filtered)
+        np.add.at(envelope, positions, np.broadcast_to(window[:, np.newaxis], filtered.shape))
+        np.divide(output, envelope, out=output, where=envelope > 1e-6)
         
-        return modified_audio 
\ No newline at end of file
+        return output[:n_samples]
@@ -9,6 +9,7 @@ import asyncio
 import sys
 import os
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
@@ -20,6 +21,7 @@ from utils.config_manager import ConfigManager
 from utils.file_detector import FileDetector
 from engines.tts_factory import TTSEngineFactory
 from readers.reader_factory import ReaderFactory
+from readers._cache import configure as configure_reader_cache
 from profiles.voice_manager import VoiceManager
 from utils.exceptions import (
     TTSBaseException, TTSEngineError, FileReaderError,
@@ -38,6 +40,11 @@ class UniversalTTSSystem:
             self.file_detector = FileDetector()
             self.tts_factory = TTSEngineFactory()
             self.reader_factory = ReaderFactory()
+            configure_reader_cache(
+                enabled=self.config.get('cache.enabled', True),
+                max_size_mb=self.config.get('cache.max_size_mb', 100),
+                max_age_days=self.config.get('cache.max_age_days', 7)
+            )
             self.voice_manager = VoiceManager()
             self.logger.info("Universal TTS System initialized")
         except Exception as e:
@@ -137,6 +144,16 @@ class UniversalTTSSystem:
             self.logger.error(f"Unexpected error processing {file_path}: {str(e)}")
             raise
 
+@lru_cache(maxsize=1)
+def get_system() -> UniversalTTSSystem:
+    """
+    Get the process-wide TTS system, creating it on first use.
+
+    Returns:
+        UniversalTTSSystem: Shared system instance
+    """
+    return UniversalTTSSystem()
+
 async def main() -> None:
     """Main entry point for the CLI interface."""
     parser = argparse.ArgumentParser(description="Universal Text-to-Speech System")
@@ -149,7 +166,7 @@ async def main() -> None:
     args = parser.parse_args()
 
     try:
-        tts_system = UniversalTTSSystem()
+        tts_system = get_system()
         
         for file_path in args.files:
             try:
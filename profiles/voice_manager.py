@@ -7,11 +7,31 @@ from pathlib import Path
 import shutil
 from datetime import datetime
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import yaml
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
 
 from utils.exceptions import VoiceProfileError
 from utils.logger import TTSLogger
 
+def _serialize(data: Dict[str, Any]) -> bytes:
+    """Encode profile data for on-disk storage"""
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def _deserialize(data: bytes) -> Dict[str, Any]:
+    """Decode profile data from on-disk storage"""
+    return json.loads(data)
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write data with a single write to a temp file, then rename it over path"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
 class VoiceManager:
     """Manager for voice profiles"""
     
@@ -19,17 +39,57 @@ class VoiceManager:
         self.profiles_dir = Path(profiles_dir)
         self.profiles_dir.mkdir(exist_ok=True)
         self.profiles: Dict[str, Dict[str, Any]] = {}
+        self._index_path = self.profiles_dir / "index.json"
         self._load_profiles()
     
+    def _flush_index(self) -> None:
+        """Atomically write all profiles to the index file"""
+        _atomic_write(self._index_path, _serialize(self.profiles))
+    
+    @staticmethod
+    def _read_profile(profile_file: Path) -> Optional[Dict[str, Any]]:
+        """Read a single profile file, returning None if it can't be parsed"""
+        try:
+            if profile_file.suffix == ".json":
+                return _deserialize(profile_file.read_bytes())
+            with open(profile_file, 'r') as f:
+                return yaml.load(f, Loader=_Loader)
+        except Exception as e:
+            print(f"Error loading profile {profile_file}: {str(e)}")
+            return None
+    
     def _load_profiles(self) -> None:
         """Load all voice profiles from disk"""
-        for profile_file in self.profiles_dir.glob("*.yaml"):
+        if self._index_path.exists():
             try:
-                with open(profile_file, 'r') as f:
-                    profile = yaml.safe_load(f)
+                self.profiles = _deserialize(self._index_path.read_bytes())
+                return
+            except Exception as e:
+                print(f"Error loading profile index {self._index_path}: {str(e)}")
+        
+        # No usable index: fall back to per-profile files, YAML first so JSON copies win
+        profile_files = list(self.profiles_dir.glob("*.yaml"))
+        profile_files += [f for f in self.profiles_dir.glob("*.json") if f != self._index_path]
+        if not profile_files:
+            return
+        
+        # Read and parse files concurrently; populate the dict from this thread only
+        max_workers = min(32, (os.cpu_count() or 1) * 4, len(profile_files))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for profile_file, profile in zip(profile_files, executor.map(self._read_profile, profile_files)):
+                if profile is None:
+                    continue
+                try:
                     self.profiles[profile["name"]] = profile
+                except Exception as e:
+                    print(f"Error loading profile {profile_file}: {str(e)}")
+        
+        # Migrate to the single index file
+        if self.profiles:
+            try:
+                self._flush_index()
             except Exception as e:
-                print(f"Error loading profile {profile_file}: {str(e)}")
+                print(f"Error writing profile index {self._index_path}: {str(e)}")
     
     def create_profile(self, name: str, engine: str, voice_id: str, settings: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -57,12 +117,10 @@ class VoiceManager:
             "settings": settings
         }
         
-        # Save to disk
-        profile_path = self.profiles_dir / f"{name}.yaml"
-        with open(profile_path, 'w') as f:
-            yaml.dump(profile, f, default_flow_style=False)
-        
         self.profiles[name] = profile
+        
+        # Save to disk
+        self._flush_index()
         return profile
     
     def update_profile(self, name: str, settings: Dict[str, Any]) -> Dict[str, Any]:
@@ -83,12 +141,12 @@ class VoiceManager:
             raise ValueError(f"Profile '{name}' not found")
         
         profile = self.profiles[name]
-        profile["settings"].update(settings)
+        current = profile["settings"]
         
-        # Save to disk
-        profile_path = self.profiles_dir / f"{name}.yaml"
-        with open(profile_path, 'w') as f:
-            yaml.dump(profile, f, default_flow_style=False)
+        # Only rewrite the index when something actually changed
+        if any(key not in current or current[key] != value for key, value in settings.items()):
+            current.update(settings)
+            self._flush_index()
         
         return profile
     
@@ -105,12 +163,13 @@ class VoiceManager:
         if name not in self.profiles:
             raise ValueError(f"Profile '{name}' not found")
         
-        # Delete from disk
-        profile_path = self.profiles_dir / f"{name}.yaml"
-        if profile_path.exists():
-            os.remove(profile_path)
-        
         del self.profiles[name]
+        self._flush_index()
+        
+        # Remove any legacy per-profile files so they can't resurface
+        for profile_path in (self.profiles_dir / f"{name}.json", self.profiles_dir / f"{name}.yaml"):
+            if profile_path.exists():
+                os.remove(profile_path)
     
     def get_profile(self, name: str) -> Optional[Dict[str, Any]]:
         """
@@ -147,8 +206,8 @@ class VoiceManager:
         if name not in self.profiles:
             raise ValueError(f"Profile '{name}' not found")
         
-        with open(output_path, 'w') as f:
-            yaml.dump(self.profiles[name], f, default_flow_style=False)
+        data = yaml.dump(self.profiles[name], Dumper=_Dumper, default_flow_style=False)
+        _atomic_write(output_path, data.encode("utf-8"))
     
     def import_profile(self, profile_path: str) -> Dict[str, Any]:
         """
@@ -164,7 +223,7 @@ class VoiceManager:
             ValueError: If profile with same name exists
         """
         with open(profile_path, 'r') as f:
-            profile = yaml.safe_load(f)
+            profile = yaml.load(f, Loader=_Loader)
         
         return self.create_profile(
             name=profile["name"],
@@ -192,15 +251,29 @@ class VoiceManager:
         if new_name in self.profiles:
             raise ValueError(f"Profile '{new_name}' already exists")
         
-        profile = self.profiles[name].copy()
-        profile["name"] = new_name
+        # Copy in memory; settings get their own dict so updates don't leak between profiles
+        source = self.profiles[name]
+        profile = {**source, "name": new_name, "settings": dict(source["settings"])}
         
-        return self.create_profile(
-            name=new_name,
-            engine=profile["engine"],
-            voice_id=profile["voice_id"],
-            settings=profile["settings"]
-        )
+        self.profiles[new_name] = profile
+        self._flush_index()
+        return profile
+
+    @staticmethod
+    def _batched_copy(src_paths: List[Path], dst_dir: Path) -> None:
+        """
+        Copy files into dst_dir, overlapping the per-file I/O.
+
+        Args:
+            src_paths: Files to copy
+            dst_dir: Destination directory
+        """
+        if not src_paths:
+            return
+        max_workers = min(32, (os.cpu_count() or 1) * 4, len(src_paths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # list() surfaces the first copy error, if any
+            list(executor.map(lambda src: shutil.copy2(src, dst_dir), src_paths))
 
     def backup_profiles(self, backup_dir: str) -> str:
         """
@@ -221,9 +294,8 @@ class VoiceManager:
             backup_path = backup_dir / f"profiles_backup_{timestamp}"
             backup_path.mkdir(parents=True, exist_ok=True)
 
-            # Copy all profile files
-            for profile_file in self.profiles_dir.glob("*.yaml"):
-                shutil.copy2(profile_file, backup_path)
+            # Write the in-memory index directly rather than copying it back off disk
+            _atomic_write(backup_path / self._index_path.name, _serialize(self.profiles))
 
             return str(backup_path)
         except Exception as e:
@@ -243,12 +315,13 @@ class VoiceManager:
 
             # Clear existing profiles
             self.profiles.clear()
-            for profile_file in self.profiles_dir.glob("*.yaml"):
-                profile_file.unlink()
+            for pattern in ("*.json", "*.yaml"):
+                for profile_file in self.profiles_dir.glob(pattern):
+                    profile_file.unlink()
 
-            # Restore profiles from backup
-            for profile_file in backup_dir.glob("*.yaml"):
-                shutil.copy2(profile_file, self.profiles_dir)
+            # Restore profiles from backup (older backups hold per-profile files)
+            backup_files = [f for pattern in ("*.json", "*.yaml") for f in backup_dir.glob(pattern)]
+            self._batched_copy(backup_files, self.profiles_dir)
 
             # Reload profiles
             self._load_profiles()
@@ -0,0 +1,146 @@
+"""Disk cache of extracted text chunks, keyed by file content"""
+
+import functools
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+def _user_cache_dir() -> Path:
+    """Get the per-user cache directory for this platform"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "universal_tts_system" / "readers"
+
+# Per user rather than next to the package, which may be installed read-only
+# or shared between users
+CACHE_DIR = _user_cache_dir()
+
+# Part of every key. Bump it whenever a reader's output changes so entries
+# extracted by the old code are never served again
+_CACHE_VERSION = 1
+
+# Limits matching the cache section of the config; see configure()
+_settings = {
+    "enabled": True,
+    "max_size_bytes": 100 * 1024 * 1024,
+    "max_age_seconds": 7 * 24 * 60 * 60
+}
+
+class Uncached(list):
+    """
+    Chunks from a degraded extraction path (e.g. raw bytes decoded as text).
+    They are returned to the caller as usual but never written to the cache,
+    so a later run with a working backend extracts the file properly.
+    """
+
+def configure(enabled: bool = True, max_size_mb: float = 100, max_age_days: float = 7) -> None:
+    """
+    Apply the cache section of the config to the reader cache.
+    
+    Args:
+        enabled: Whether to read and write cached chunks at all
+        max_size_mb: Total size the cache directory is pruned back to
+        max_age_days: Entries written longer ago than this are discarded
+    """
+    _settings["enabled"] = enabled
+    _settings["max_size_bytes"] = max_size_mb * 1024 * 1024
+    _settings["max_age_seconds"] = max_age_days * 24 * 60 * 60
+
+def _prune() -> None:
+    """
+    Drop expired entries, then the least recently used ones until under the size limit.
+    An entry's modification time is when it was written and its access time
+    when it was last served.
+    """
+    now = time.time()
+    entries = []
+    for path in CACHE_DIR.glob("*.json"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        if now - st.st_mtime > _settings["max_age_seconds"]:
+            path.unlink(missing_ok=True)
+        else:
+            entries.append((st.st_atime, st.st_size, path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= _settings["max_size_bytes"]:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+def _cache_key(file_path: str, variant: str) -> str:
+    """Hash the file content together with the cache version and extraction variant"""
+    digest = hashlib.blake2b(f"{_CACHE_VERSION}:{variant}".encode("utf-8"), digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def get_or_extract(file_path: str, extractor: Callable[[], List[str]], variant: str = "") -> List[str]:
+    """
+    Return cached chunks for an unchanged file, or extract and cache them.
+    
+    Args:
+        file_path: Path to the source file
+        extractor: Callable producing the chunks on a cache miss
+        variant: Extra key material (reader, backend and chunk size)
+        
+    Returns:
+        List of text chunks
+    """
+    if not _settings["enabled"]:
+        return extractor()
+    
+    try:
+        cache_path = CACHE_DIR / f"{_cache_key(file_path, variant)}.json"
+        if cache_path.exists():
+            st = cache_path.stat()
+            if time.time() - st.st_mtime <= _settings["max_age_seconds"]:
+                chunks = json.loads(cache_path.read_bytes())
+                # Record the use in the access time only, so the age still
+                # counts from when the entry was written
+                os.utime(cache_path, (time.time(), st.st_mtime))
+                return chunks
+    except Exception:
+        # Unreadable source or corrupt entry: let the extractor decide
+        cache_path = None
+    
+    chunks = extractor()
+    
+    # Empty or degraded output is more likely a failed extraction than the
+    # file's real content, so it is never kept
+    if cache_path is not None and chunks and not isinstance(chunks, Uncached):
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_bytes(json.dumps(chunks).encode("utf-8"))
+            os.replace(tmp_path, cache_path)
+            _prune()
+        except Exception as e:
+            print(f"Error caching extracted text for {file_path}: {str(e)}")
+    
+    return chunks
+
+def cached_chunks(extract: Callable) -> Callable:
+    """
+    Decorator caching a reader's extract_text_chunks results on disk.
+    Readers name the parsing library in use in a cache_backend attribute,
+    so installing or removing one invalidates their entries.
+    """
+    @functools.wraps(extract)
+    def wrapper(self, file_path: str, chunk_size: int = 1000) -> List[str]:
+        backend = getattr(self, "cache_backend", "")
+        variant = f"{type(self).__name__}:{backend}:{chunk_size}"
+        return get_or_extract(file_path, lambda: extract(self, file_path, chunk_size), variant)
+    return wrapper
@@ -1,13 +1,13 @@
 from .base_reader import BaseReader
+from ._cache import cached_chunks
 from docx import Document
 
 class DOCXReader(BaseReader):
+    @cached_chunks
     def extract_text_chunks(self, file_path, chunk_size=1000):
         doc = Document(file_path)
-        full_text = []
-        for para in doc.paragraphs:
-            if para.text.strip():
-                full_text.append(para.text.strip())
-        text = '\n'.join(full_text)
+        # Strip each paragraph once and join non-empty ones in a single pass
+        stripped = (para.text.strip() for para in doc.paragraphs)
+        text = '\n'.join(line for line in stripped if line)
         # Split into chunks
         return [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)] 
\ No newline at end of file
@@ -1,9 +1,15 @@
 from ebooklib import epub
-from bs4 import BeautifulSoup
+import lxml.html
 from typing import Optional, List
 import os
+import re
+import io
 from utils.logger import TTSLogger
 from utils.exceptions import FileReaderError
+from ._cache import cached_chunks
+
+# Sentence boundary: whitespace (including newlines) after terminal punctuation
+SENT_RE = re.compile(r'(?<=[.!?])\s+')
 
 class EPUBReader:
     """Reader for extracting text from EPUB files."""
@@ -11,6 +17,14 @@ class EPUBReader:
     def __init__(self):
         self.logger = TTSLogger()
 
+    @staticmethod
+    def _parse_html(content: bytes) -> lxml.html.HtmlElement:
+        """Parse an EPUB document item, dropping script and style elements"""
+        root = lxml.html.fromstring(content)
+        for element in list(root.iter('script', 'style')):
+            element.drop_tree()
+        return root
+
     @staticmethod
     def extract_text(file_path: str) -> Optional[str]:
         try:
@@ -35,12 +49,11 @@ class EPUBReader:
                     print(f"Processing item {i}/{total_items}")
                     content = item.get_content()
                     if content:
-                        soup = BeautifulSoup(content, 'html.parser')
-                        # Remove script and style elements
-                        for script in soup(["script", "style"]):
-                            script.decompose()
+                        root = EPUBReader._parse_html(content)
                         # Get text and clean it
-                        item_text = soup.get_text(separator='\n', strip=True)
+                        item_text = '\n'.join(
+                            part.strip() for part in root.itertext() if part.strip()
+                        )
                         if item_text:
                             text.append(item_text)
             
@@ -56,37 +69,45 @@ class EPUBReader:
             print(f"Error reading EPUB: {str(e)}")
             return None 
 
+    @cached_chunks
     def extract_text_chunks(self, file_path: str, chunk_size: int = 1000) -> List[str]:
         """Extract text from EPUB file in chunks"""
         try:
             book = epub.read_epub(file_path)
             chunks = []
-            current_chunk = []
+            # One buffer reused for every chunk in the book
+            buffer = io.StringIO()
             current_size = 0
             
             for item in book.get_items():
                 if item.get_type() == 9:
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    text = soup.get_text()
+                    content = item.get_content()
+                    if not content:
+                        continue
+                    text = self._parse_html(content).text_content()
                     
                     # Split text into sentences
-                    sentences = text.split('. ')
+                    sentences = SENT_RE.split(text)
                     
                     for sentence in sentences:
-                        sentence = sentence.strip() + '. '
+                        sentence = sentence.strip()
+                        if not sentence:
+                            continue
+                        sentence += ' '
                         sentence_size = len(sentence)
                         
-                        if current_size + sentence_size > chunk_size and current_chunk:
-                            chunks.append(''.join(current_chunk))
-                            current_chunk = []
+                        if current_size + sentence_size > chunk_size and current_size:
+                            chunks.append(buffer.getvalue())
+                            buffer.seek(0)
+                            buffer.truncate()
                             current_size = 0
                         
-                        current_chunk.append(sentence)
+                        buffer.write(sentence)
                         current_size += sentence_size
             
             # Add the last chunk if it exists
-            if current_chunk:
-                chunks.append(''.join(current_chunk))
+            if current_size:
+                chunks.append(buffer.getvalue())
             
             return chunks
         except Exception as e:
@@ -1,4 +1,5 @@
 from .base_reader import BaseReader
+from ._cache import Uncached, cached_chunks
 try:
     from ebooklib import epub
     import mobi
@@ -7,6 +8,9 @@ except ImportError:
     mobi = None
 
 class MOBIReader(BaseReader):
+    cache_backend = "+".join(name for name, module in (("mobi", mobi), ("ebooklib", epub)) if module)
+    
+    @cached_chunks
     def extract_text_chunks(self, file_path, chunk_size=1000):
         text = ""
         # Try mobi module
@@ -29,4 +33,5 @@ class MOBIReader(BaseReader):
         if not text:
             with open(file_path, 'rb') as f:
                 text = f.read().decode(errors='ignore')
+            return Uncached(text[i:i+chunk_size] for i in range(0, len(text), chunk_size))
         return [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)] 
\ No newline at end of file
@@ -1,11 +1,53 @@
-from typing import List
-import PyPDF2
+from typing import Iterator, List
 import os
 from .base_reader import BaseReader
+from ._cache import Uncached, cached_chunks
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
 
 class PDFReader(BaseReader):
-    """Reader for PDF files using PyPDF2"""
+    """Reader for PDF files using PDFium, with PyPDF2 as a fallback"""
     
+    # The two libraries extract different text from the same file
+    cache_backend = "pypdfium2" if pdfium else "PyPDF2"
+    
+    @staticmethod
+    def _iter_page_texts(file_path: str) -> Iterator[str]:
+        """
+        Yield the text of each page in a PDF file.
+        
+        Args:
+            file_path: Path to the PDF file
+            
+        Returns:
+            Iterator over page texts
+        """
+        if pdfium:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    try:
+                        yield textpage.get_text_range()
+                    finally:
+                        textpage.close()
+                        page.close()
+            finally:
+                pdf.close()
+        elif PyPDF2:
+            with open(file_path, 'rb') as file:
+                for page in PyPDF2.PdfReader(file).pages:
+                    yield page.extract_text()
+        else:
+            raise ImportError("PDF support requires pypdfium2 or PyPDF2")
+    
+    @cached_chunks
     def extract_text_chunks(self, file_path: str, chunk_size: int = 1000) -> List[str]:
         """
         Extract text from PDF file in chunks.
@@ -21,32 +63,32 @@ class PDFReader(BaseReader):
         try:
             # Try reading as PDF first
             chunks = []
-            current_chunk = ""
+            # Words of the chunk being built and its joined length; joined once per chunk
+            current_words = []
+            current_size = 0
             
-            with open(file_path, 'rb') as file:
-                try:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    
-                    for page in pdf_reader.pages:
-                        text = page.extract_text()
-                        words = text.split()
-                        
-                        for word in words:
-                            if len(current_chunk) + len(word) + 1 <= chunk_size:
-                                current_chunk += " " + word if current_chunk else word
-                            else:
-                                if current_chunk:
-                                    chunks.append(current_chunk)
-                                current_chunk = word
+            try:
+                for text in self._iter_page_texts(file_path):
+                    words = text.split()
                     
-                    if current_chunk:
-                        chunks.append(current_chunk)
+                    for word in words:
+                        if current_size + len(word) + 1 <= chunk_size:
+                            current_size += len(word) + (1 if current_words else 0)
+                            current_words.append(word)
+                        else:
+                            if current_words:
+                                chunks.append(" ".join(current_words))
+                            current_words = [word]
+                            current_size = len(word)
+                
+                if current_words:
+                    chunks.append(" ".join(current_words))
+                
+                if chunks:  # If we successfully read PDF content
+                    return chunks
                     
-                    if chunks:  # If we successfully read PDF content
-                        return chunks
-                        
-                except Exception as pdf_error:
-                    print(f"PDF reading failed: {str(pdf_error)}")
+            except Exception as pdf_error:
+                print(f"PDF reading failed: {str(pdf_error)}")
             
             # Fallback to text file reading
             print("Falling back to text file reading...")
@@ -56,10 +98,10 @@ class PDFReader(BaseReader):
             # Split text into chunks
             for i in range(0, len(text), chunk_size):
                 chunk = text[i:i + chunk_size]
-                if chunk.strip():  # Only add non-empty chunks
+                if chunk and not chunk.isspace():  # Only add non-empty chunks
                     chunks.append(chunk)
             
-            return chunks
+            return Uncached(chunks)
             
         except Exception as e:
             raise Exception(f"Error reading file: {str(e)}") 
\ No newline at end of file
@@ -3,27 +3,25 @@
 Reader factory for Universal TTS System
 """
 
-from typing import Optional
+import importlib
+from typing import Dict, Optional, Tuple
 from .base_reader import BaseReader
-from .epub_reader import EPUBReader
-from .pdf_reader import PDFReader
-from .docx_reader import DOCXReader
-from .md_reader import MDReader
-from .mobi_reader import MOBIReader
-from .txt_reader import TxtReader
+
+# Readers are imported on first use so their parsing libraries load only when needed
+_READER_CLASSES: Dict[str, Tuple[str, str]] = {
+    'pdf': ('.pdf_reader', 'PDFReader'),
+    'epub': ('.epub_reader', 'EPUBReader'),
+    'docx': ('.docx_reader', 'DOCXReader'),
+    'mobi': ('.mobi_reader', 'MOBIReader'),
+    'md': ('.md_reader', 'MDReader'),
+    'txt': ('.txt_reader', 'TxtReader')
+}
 
 class ReaderFactory:
     """Factory for creating appropriate file readers"""
     
     def __init__(self):
-        self.readers = {
-            'pdf': PDFReader(),
-            'epub': EPUBReader(),
-            'docx': DOCXReader(),
-            'mobi': MOBIReader(),
-            'md': MDReader(),
-            'txt': TxtReader()
-        }
+        self.readers: Dict[str, BaseReader] = {}
     
     def get_reader(self, file_type: str) -> Optional[BaseReader]:
         """
@@ -35,7 +33,14 @@ class ReaderFactory:
         Returns:
             Reader instance or None if no reader available
         """
-        return self.readers.get(file_type.lower())
+        file_type = file_type.lower()
+        if file_type not in self.readers:
+            if file_type not in _READER_CLASSES:
+                return None
+            module_name, class_name = _READER_CLASSES[file_type]
+            module = importlib.import_module(module_name, package=__package__)
+            self.readers[file_type] = getattr(module, class_name)()
+        return self.readers[file_type]
 
     def list_supported_types(self):
         return ["txt", "pdf", "docx", "html", "json", "md", "mobi"]
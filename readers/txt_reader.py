@@ -31,7 +31,7 @@ class TxtReader(BaseReader):
             chunks = []
             for i in range(0, len(text), chunk_size):
                 chunk = text[i:i + chunk_size]
-                if chunk.strip():  # Only add non-empty chunks
+                if chunk and not chunk.isspace():  # Only add non-empty chunks
                     chunks.append(chunk)
             
             return chunks
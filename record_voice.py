@@ -8,6 +8,7 @@ import soundfile as sf
 import numpy as np
 import os
 import time
+import threading
 
 def record_voice(duration=5, sample_rate=22050, output_file="sample_voice.wav"):
     """
@@ -39,19 +40,28 @@ def record_voice(duration=5, sample_rate=22050, output_file="sample_voice.wav"):
         
         print("\nRecording started!")
         
-        # Record audio
-        recording = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
-            channels=1,
-            dtype='float32'
-        )
+        # Record 16-bit samples straight into a pre-allocated buffer
+        n_samples = int(duration * sample_rate)
+        recording = np.empty((n_samples, 1), dtype=np.int16)
+        position = 0
+        finished = threading.Event()
+        
+        def callback(indata, frames, time_info, status):
+            nonlocal position
+            count = min(frames, n_samples - position)
+            recording[position:position + count] = indata[:count]
+            position += count
+            if position >= n_samples:
+                raise sd.CallbackStop
         
         # Wait for recording to complete
-        sd.wait()
+        with sd.InputStream(samplerate=sample_rate, channels=1, dtype='int16',
+                            callback=callback, finished_callback=finished.set):
+            finished.wait()
+        recording = recording[:position]
         
         # Save recording
-        sf.write(output_file, recording, sample_rate)
+        sf.write(output_file, recording, sample_rate, subtype='PCM_16')
         
         print(f"\nRecording completed!")
         print(f"Saved to: {output_file}")
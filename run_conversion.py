@@ -1,6 +1,6 @@
 import argparse
 import asyncio
-from main import UniversalTTSSystem
+from main import get_system
 
 async def main():
     parser = argparse.ArgumentParser(description="Universal TTS System - Single File Conversion")
@@ -10,7 +10,7 @@ async def main():
     parser.add_argument("--format", "-f", default="mp3", choices=["mp3", "wav", "ogg"], help="Output audio format")
     args = parser.parse_args()
 
-    tts = UniversalTTSSystem()
+    tts = get_system()
     await tts.process_file(
         args.file,
         voice_profile=args.voice,
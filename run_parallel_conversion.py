@@ -2,24 +2,27 @@ import multiprocessing
 import sys
 import os
 import asyncio
-from main import UniversalTTSSystem
+from main import UniversalTTSSystem, get_system
 from typing import List
 import time
 
+SUPPORTED_EXTENSIONS = frozenset({'.pdf', '.epub', '.docx', '.md', '.mobi'})
+
 def get_supported_files() -> List[str]:
     """Get list of supported files in current directory"""
-    return [
-        f for f in os.listdir('.') 
-        if f.lower().endswith(('.pdf', '.epub', '.docx', '.md', '.mobi'))
-    ]
+    with os.scandir('.') as entries:
+        return [
+            entry.name for entry in entries
+            if entry.is_file(follow_symlinks=False)
+            and os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS
+        ]
 
-async def process_file_async(file_path: str) -> None:
+async def process_file_async(tts: UniversalTTSSystem, file_path: str) -> None:
     """Process a single file asynchronously"""
     try:
         print(f"\nStarting conversion of: {file_path}")
         start_time = time.time()
         
-        tts = UniversalTTSSystem()
         output_path = await tts.process_file(
             file_path,
             voice_profile="default",
@@ -35,9 +38,19 @@ async def process_file_async(file_path: str) -> None:
     except Exception as e:
         print(f"\nError processing {file_path}: {str(e)}")
 
+# Event loop of the current worker process, shared by every file it converts
+_worker_loop = None
+
+def _init_worker() -> None:
+    """Create the worker's event loop once"""
+    global _worker_loop
+    _worker_loop = asyncio.new_event_loop()
+
 def process_file(file_path: str) -> None:
-    """Process a single file (wrapper for async function)"""
-    asyncio.run(process_file_async(file_path))
+    """Process a single file in a worker process (wrapper for async function)"""
+    # Reading and synthesis block, so files only run in parallel across
+    # processes; each worker builds its system once and reuses it per file
+    _worker_loop.run_until_complete(process_file_async(get_system(), file_path))
 
 def main():
     # Get list of supported files
@@ -52,12 +65,12 @@ def main():
         print(f"- {f}")
     
     # Calculate optimal number of processes
-    num_processes = min(len(input_files), multiprocessing.cpu_count())
+    num_processes = min(len(input_files), os.cpu_count() or 1)
     print(f"\nUsing {num_processes} processes for parallel conversion")
     
     # Process files in parallel
-    with multiprocessing.Pool(processes=num_processes) as pool:
-        pool.map(process_file, input_files)
+    with multiprocessing.Pool(processes=num_processes, initializer=_init_worker) as pool:
+        pool.map(process_file, input_files, chunksize=1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
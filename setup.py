@@ -5,13 +5,16 @@ setup(
     version="1.0.0",
     packages=find_packages(),
     install_requires=[
-        'pyttsx3==2.90',
-        'PyPDF2==3.0.1',
+        # Same specifiers as requirements.txt
+        'pyttsx3>=2.90',
+        'pypdfium2>=4.0.0',
+        'PyPDF2>=3.0.0',
         'ebooklib==0.18',
-        'beautifulsoup4==4.12.2',
-        'pydub==0.25.1',
-        'numpy==1.24.3',
-        'pytest==7.4.0',
+        'lxml>=4.9.3',
+        'pydub>=0.25.1',
+        'aiohttp>=3.8.0',
+        'numpy>=1.21.0',
+        'pytest>=7.4.0',
         'pytest-asyncio==0.21.1',
     ],
     author="Your Name",
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+import soundfile as sf
+from utils.advanced_audio_processor import AdvancedAudioProcessor
+
+@pytest.mark.parametrize("effects", [
+    {'compression': {'threshold': -20, 'ratio': 4.0}},
+    {'reverb': {'room_size': 0.05, 'damping': 0.5, 'wet_level': 0.3}},
+    {'reverb': {'room_size': 0.005, 'damping': 0.5, 'wet_level': 0.3}},
+    {'echo': {'delay': 0.05, 'feedback': 0.4, 'taps': 3}},
+])
+def test_block_processing_matches_in_memory(tmp_path, effects):
+    """Test that block processing gives the same output as processing the whole file"""
+    sample_rate = 44100
+    audio = (0.3 * np.random.default_rng(0).standard_normal(sample_rate)).astype(np.float32)
+    input_path = str(tmp_path / 'in.wav')
+    sf.write(input_path, audio, sample_rate, subtype='FLOAT')
+    
+    config = {'sample_rate': sample_rate, 'block_size': 4096}
+    streaming = AdvancedAudioProcessor(dict(config, streaming=True))
+    assert streaming._can_stream(input_path, effects)
+    
+    streaming.process_audio(input_path, str(tmp_path / 'blocks.wav'), effects)
+    AdvancedAudioProcessor(config).process_audio(input_path, str(tmp_path / 'whole.wav'), effects)
+    
+    blocks, _ = sf.read(str(tmp_path / 'blocks.wav'), dtype='float32')
+    whole, _ = sf.read(str(tmp_path / 'whole.wav'), dtype='float32')
+    assert len(blocks) == len(whole) == len(audio)
+    np.testing.assert_allclose(blocks, whole, rtol=1e-4, atol=1e-4)
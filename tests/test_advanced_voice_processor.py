@@ -0,0 +1,14 @@
+import numpy as np
+import pytest
+from scipy import fft
+from utils.advanced_voice_processor import _autocorrelation
+
+@pytest.mark.parametrize("length", [8, 1013])
+def test_autocorrelation_odd_fft_length(length):
+    """Test the FFT autocorrelation against np.correlate when the FFT size is odd"""
+    assert fft.next_fast_len(2 * length - 1) % 2 == 1
+    
+    audio = np.random.default_rng(0).standard_normal(length)
+    n_lags = min(length, 9)
+    expected = np.correlate(audio, audio, mode='full')[length - 1:length - 1 + n_lags]
+    np.testing.assert_allclose(_autocorrelation(audio, n_lags), expected, rtol=1e-9, atol=1e-9)
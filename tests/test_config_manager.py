@@ -0,0 +1,28 @@
+import yaml
+from utils.config_manager import ConfigManager
+
+def _read(config_file):
+    with open(config_file) as f:
+        return yaml.safe_load(f)
+
+def test_set_writes_immediately_by_default(tmp_path):
+    """Test that set() saves the config file when writes aren't deferred"""
+    manager = ConfigManager(str(tmp_path / 'config'))
+    manager.load_config()
+    manager.set('logging.level', 'DEBUG')
+    assert _read(manager.config_file)['logging']['level'] == 'DEBUG'
+
+def test_deferred_writes_wait_for_flush(tmp_path):
+    """Test that deferred set()/update() changes reach the file only on flush()"""
+    manager = ConfigManager(str(tmp_path / 'config'), defer_writes=True)
+    manager.load_config()
+    manager.set('logging.level', 'DEBUG')
+    manager.update({'extra': 1})
+    saved = _read(manager.config_file)
+    assert saved['logging']['level'] == 'INFO'
+    assert 'extra' not in saved
+
+    manager.flush()
+    saved = _read(manager.config_file)
+    assert saved['logging']['level'] == 'DEBUG'
+    assert saved['extra'] == 1
@@ -0,0 +1,93 @@
+import os
+import time
+import pytest
+from readers import _cache
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the reader cache at a temporary directory with default limits"""
+    monkeypatch.setattr(_cache, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(_cache, '_settings', dict(_cache._settings))
+    _cache.configure()
+    return tmp_path / 'cache'
+
+def _counting_extractor(chunks):
+    """Create an extractor returning chunks and counting its calls"""
+    calls = []
+    def extractor():
+        calls.append(1)
+        return chunks
+    return extractor, calls
+
+def test_hit_skips_extraction(tmp_path, cache_dir):
+    """Test that an unchanged file is extracted only once"""
+    source = tmp_path / 'book.txt'
+    source.write_text('hello world')
+    extractor, calls = _counting_extractor(['hello', 'world'])
+
+    assert _cache.get_or_extract(str(source), extractor, 'r:10') == ['hello', 'world']
+    assert _cache.get_or_extract(str(source), extractor, 'r:10') == ['hello', 'world']
+    assert len(calls) == 1
+
+def test_miss_on_changed_content_or_variant(tmp_path, cache_dir):
+    """Test that changed content or a different variant is extracted again"""
+    source = tmp_path / 'book.txt'
+    source.write_text('hello world')
+    extractor, calls = _counting_extractor(['hello world'])
+
+    _cache.get_or_extract(str(source), extractor, 'r:10')
+    _cache.get_or_extract(str(source), extractor, 'r:20')
+    source.write_text('hello there')
+    _cache.get_or_extract(str(source), extractor, 'r:10')
+    assert len(calls) == 3
+
+def test_version_bump_invalidates(tmp_path, cache_dir, monkeypatch):
+    """Test that entries written under an older cache version are not served"""
+    source = tmp_path / 'book.txt'
+    source.write_text('hello world')
+    extractor, calls = _counting_extractor(['hello world'])
+
+    _cache.get_or_extract(str(source), extractor)
+    monkeypatch.setattr(_cache, '_CACHE_VERSION', _cache._CACHE_VERSION + 1)
+    _cache.get_or_extract(str(source), extractor)
+    assert len(calls) == 2
+
+def test_empty_and_degraded_output_not_cached(tmp_path, cache_dir):
+    """Test that empty lists and Uncached chunks are never written"""
+    source = tmp_path / 'book.txt'
+    source.write_text('hello world')
+
+    for chunks in ([], _cache.Uncached(['hello world'])):
+        extractor, calls = _counting_extractor(chunks)
+        _cache.get_or_extract(str(source), extractor)
+        _cache.get_or_extract(str(source), extractor)
+        assert len(calls) == 2
+    assert not list(cache_dir.glob('*.json'))
+
+def test_hit_keeps_write_time(tmp_path, cache_dir):
+    """Test that serving an entry does not reset its age"""
+    source = tmp_path / 'book.txt'
+    source.write_text('hello world')
+    extractor, _ = _counting_extractor(['hello world'])
+
+    _cache.get_or_extract(str(source), extractor)
+    entry, = cache_dir.glob('*.json')
+    written = time.time() - 3600
+    os.utime(entry, (written, written))
+    _cache.get_or_extract(str(source), extractor)
+    assert entry.stat().st_mtime == pytest.approx(written)
+
+def test_prune_drops_expired_then_least_recently_used(tmp_path, cache_dir):
+    """Test pruning by age and then by size"""
+    now = time.time()
+    cache_dir.mkdir()
+    for name, used, written in (('old', now, now - 3 * 86400),
+                                ('lru', now - 60, now),
+                                ('mru', now, now)):
+        entry = cache_dir / f'{name}.json'
+        entry.write_bytes(b'x' * 100)
+        os.utime(entry, (used, written))
+
+    _cache.configure(max_size_mb=150 / (1024 * 1024), max_age_days=2)
+    _cache._prune()
+    assert sorted(path.stem for path in cache_dir.glob('*.json')) == ['mru']
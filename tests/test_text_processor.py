@@ -0,0 +1,56 @@
+import random
+import re
+import pytest
+import utils.text_processor as tp
+from utils.text_processor import TextProcessor
+
+@pytest.fixture
+def text_processor():
+    """Create a TextProcessor with default settings"""
+    return TextProcessor({})
+
+def test_split_into_chunks_skips_blank_paragraphs(text_processor):
+    """Test that runs of blank lines never produce empty chunks"""
+    chunks = text_processor.split_into_chunks('aaaa\n\n\n\nbbbb\n\n\n\ncccc', 5)
+    assert chunks == ['aaaa', 'bbbb', 'cccc']
+
+def test_split_into_chunks_never_blank(text_processor):
+    """Test chunk size limits and non-blank chunks on random text"""
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = ''.join(rng.choice(['a', 'bb', ' ', '. ', '\n', '\n\n']) for _ in range(rng.randint(0, 60)))
+        max_size = rng.randint(1, 20)
+        chunks = text_processor.split_into_chunks(text, max_size)
+        if len(text) > max_size:
+            assert all(chunk.strip() for chunk in chunks)
+            assert all(len(chunk) <= max_size for chunk in chunks)
+
+_TOKENS = ['a', 'é', '中', '😀', ' ', '  ', '.', ',', '!', '?', '"', "'", '(', ')',
+           '\n', '\t', '\x1c', '\x85', '\xa0', '᠎', ' ', '​', '　']
+
+def test_whitespace_patterns_match_python_s():
+    """Test that the (possibly PCRE2) whitespace patterns agree with re's \\s"""
+    ws_ref = re.compile(r'[^\S ]\s*| \s+')
+    sent_ref = re.compile(r'(?<=[.!?])\s+')
+    for c in map(chr, range(0x10000)):
+        if 0xd800 <= ord(c) < 0xe000:
+            continue
+        # Doubled, since a lone ' ' is left alone by design
+        assert (tp._RE_WS.sub('', 'a' + c * 2 + 'a') == 'aa') == c.isspace(), hex(ord(c))
+    
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = ''.join(rng.choice(_TOKENS) for _ in range(rng.randint(0, 20)))
+        assert tp._RE_WS.sub(' ', text) == ws_ref.sub(' ', text)
+        assert tp._RE_SENT_SPLIT.sub('|', text) == sent_ref.sub('|', text)
+
+@pytest.mark.skipif(tp.njit is None, reason="numba not installed")
+def test_native_clean_matches_regex_clean(text_processor, monkeypatch):
+    """Test that the numba cleanup used on long texts matches the regex path"""
+    rng = random.Random(1)
+    text = ''.join(rng.choice(_TOKENS) for _ in range(60_000))
+    assert len(text) > tp._NATIVE_CLEAN_MIN_CHARS
+    native = text_processor._clean_text(text)
+    
+    monkeypatch.setattr(tp, '_NATIVE_CLEAN_MIN_CHARS', len(text))
+    assert native == text_processor._clean_text(text)
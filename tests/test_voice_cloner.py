@@ -0,0 +1,42 @@
+import numpy as np
+from scipy import signal
+from scipy.linalg import solve_toeplitz
+from engines.voice_cloner import VoiceCloner, _allpole_filter_frames
+
+def _frame_autocorr(frames: np.ndarray, order: int) -> np.ndarray:
+    """Biased autocorrelation lags 0..order of every column of frames"""
+    n = frames.shape[0]
+    return np.stack([np.einsum('tn,tn->n', frames[:n - k], frames[k:]) for k in range(order + 1)])
+
+def test_levinson_durbin_matches_solve_toeplitz():
+    """Test the batched Levinson-Durbin recursion against scipy's Toeplitz solver"""
+    order = 12
+    frames = np.random.default_rng(0).standard_normal((512, 6))
+    frames[:, 0] = 0.0
+    autocorr = _frame_autocorr(frames, order)
+    
+    coeffs = VoiceCloner._levinson_durbin(autocorr, order)
+    
+    # Silent frames keep the flat predictor
+    np.testing.assert_array_equal(coeffs[:, 0], np.eye(order + 1)[0])
+    for i in range(1, frames.shape[1]):
+        expected = solve_toeplitz(autocorr[:order, i], -autocorr[1:, i])
+        assert coeffs[0, i] == 1.0
+        np.testing.assert_allclose(coeffs[1:, i], expected, rtol=1e-8, atol=1e-10)
+
+def test_allpole_filter_frames_matches_lfilter():
+    """Test the per-frame all-pole filter against scipy.signal.lfilter"""
+    rng = np.random.default_rng(1)
+    frame_length, n_frames, order = 256, 5, 12
+    frames = rng.standard_normal((frame_length, n_frames)).astype(np.float32)
+    
+    # Stable filters: LPC of random frames, as extract_features would produce
+    autocorr = _frame_autocorr(rng.standard_normal((1024, n_frames)), order)
+    coeffs = VoiceCloner._levinson_durbin(autocorr, order).astype(np.float32)
+    window = np.hanning(frame_length).astype(np.float32)
+    
+    filtered = _allpole_filter_frames(frames, coeffs, window)
+    
+    for i in range(n_frames):
+        expected = signal.lfilter([1], coeffs[:, i], frames[:, i]) * window
+        np.testing.assert_allclose(filtered[:, i], expected, rtol=1e-4, atol=1e-4)
@@ -0,0 +1,49 @@
+import json
+import pytest
+import yaml
+from profiles import voice_manager
+from profiles.voice_manager import VoiceManager
+
+def _write_legacy(profiles_dir):
+    """Write per-profile files as older versions stored them"""
+    profiles_dir.mkdir()
+    with open(profiles_dir / 'calm.yaml', 'w') as f:
+        yaml.safe_dump({'name': 'calm', 'engine': 'pyttsx3', 'voice_id': 'a', 'settings': {}}, f)
+    with open(profiles_dir / 'fast.yaml', 'w') as f:
+        yaml.safe_dump({'name': 'fast', 'engine': 'pyttsx3', 'voice_id': 'old', 'settings': {}}, f)
+    (profiles_dir / 'fast.json').write_text(json.dumps(
+        {'name': 'fast', 'engine': 'gtts', 'voice_id': 'new', 'settings': {'rate': 2}}))
+
+def test_legacy_profiles_migrate_to_index(tmp_path):
+    """Test that per-profile files are loaded once and written into index.json"""
+    profiles_dir = tmp_path / 'profiles'
+    _write_legacy(profiles_dir)
+    
+    manager = VoiceManager(str(profiles_dir))
+    assert set(manager.profiles) == {'calm', 'fast'}
+    # JSON copies win over YAML ones
+    assert manager.profiles['fast']['voice_id'] == 'new'
+    
+    index = json.loads((profiles_dir / 'index.json').read_text())
+    assert index == manager.profiles
+    
+    # Later loads read the index alone
+    for legacy in ('calm.yaml', 'fast.yaml', 'fast.json'):
+        (profiles_dir / legacy).unlink()
+    assert VoiceManager(str(profiles_dir)).profiles == manager.profiles
+
+def test_failed_write_keeps_previous_index(tmp_path, monkeypatch):
+    """Test that an interrupted index write leaves the old index in place"""
+    profiles_dir = tmp_path / 'profiles'
+    manager = VoiceManager(str(profiles_dir))
+    manager.create_profile('calm', 'pyttsx3', 'a', {})
+    before = (profiles_dir / 'index.json').read_bytes()
+    
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(voice_manager.os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        manager.create_profile('fast', 'gtts', 'b', {})
+    
+    assert (profiles_dir / 'index.json').read_bytes() == before
+    assert json.loads(before) == {'calm': {'name': 'calm', 'engine': 'pyttsx3', 'voice_id': 'a', 'settings': {}}}
@@ -1,11 +1,90 @@
 import os
 import numpy as np
 import soundfile as sf
-from scipy import signal
-from scipy.signal import butter, filtfilt
+from scipy import fft, signal
+from scipy.signal import butter, filtfilt, sosfilt, sosfilt_zi, sosfiltfilt
 import librosa
 from typing import Dict, Optional, Tuple, List
 import logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from utils.stft import configure_fft_backend, stft_real, istft_real
+from utils.batch import run_batch
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _compress_kernel(audio: np.ndarray, threshold: float, slope: float, cur: float,
+                     inv_attack: float, inv_release: float, out: np.ndarray) -> float:
+    """
+    Level detection, attack/release smoothing and gain application in one
+    pass. cur is the smoothed gain reduction (dB) entering the signal; the
+    value leaving it is returned.
+    """
+    db_scale = 20.0 / np.log(10.0)
+    gain_scale = -np.log(10.0) / 20.0
+    for i in range(audio.shape[0]):
+        level = db_scale * np.log(abs(audio[i]) + 1e-10)
+        target = (level - threshold) * slope if level > threshold else 0.0
+        if target > cur:
+            cur += (target - cur) * inv_attack
+        else:
+            cur += (target - cur) * inv_release
+        out[i] = audio[i] * np.exp(gain_scale * cur)
+    return cur
+
+if njit is not None:
+    _compress_kernel = njit(cache=True, fastmath=True)(_compress_kernel)
+    # Compile now so the first compression call doesn't pay for it
+    _compress_kernel(np.zeros(2, dtype=np.float32), -20.0, 0.75, 0.0, 1.0, 1.0, np.empty(2, dtype=np.float32))
+
+@lru_cache(maxsize=256)
+def _peaking_coeffs(freq: float, gain: float, q: float, fs: float) -> Tuple[np.ndarray, np.ndarray]:
+    """RBJ peaking biquad coefficients (unnormalized), cached read-only."""
+    w0 = 2 * np.pi * freq / fs
+    alpha = np.sin(w0) / (2 * q)
+    
+    A = np.sqrt(10 ** (gain / 20))
+    
+    b0 = 1 + alpha * A
+    b1 = -2 * np.cos(w0)
+    b2 = 1 - alpha * A
+    a0 = 1 + alpha / A
+    a1 = -2 * np.cos(w0)
+    a2 = 1 - alpha / A
+    
+    b, a = np.array([b0, b1, b2]), np.array([a0, a1, a2])
+    b.setflags(write=False)
+    a.setflags(write=False)
+    return b, a
+
+@lru_cache(maxsize=32)
+def _eq_sos(bands: Tuple[Tuple[float, float, float], ...], fs: float) -> np.ndarray:
+    """Stack the peaking biquads for an EQ band list into one SOS matrix."""
+    sections = []
+    for freq, gain, q in bands:
+        b, a = _peaking_coeffs(freq, gain, q, fs)
+        sections.append(np.concatenate([b, a]) / a[0])
+    return np.array(sections).reshape(-1, 6)
+
+@lru_cache(maxsize=32)
+def _reverb_ir(ir_length: int, damping: float, wet_level: float) -> np.ndarray:
+    """Exponentially decaying reverb IR, normalized and scaled by the wet level."""
+    impulse_response = np.exp(-damping * np.arange(ir_length, dtype=np.float32))
+    impulse_response *= wet_level / np.sum(impulse_response)
+    impulse_response.setflags(write=False)
+    return impulse_response
+
+@lru_cache(maxsize=32)
+def _reverb_ir_spectrum(ir_length: int, damping: float, wet_level: float, n_fft: int) -> np.ndarray:
+    """One-sided FFT of the reverb IR at a given transform size."""
+    spectrum = fft.rfft(_reverb_ir(ir_length, damping, wet_level), n=n_fft)
+    spectrum.setflags(write=False)
+    return spectrum
+
+# Effects that can run block by block with state carried between blocks
+STREAMABLE_EFFECTS = frozenset({'equalization', 'compression', 'reverb', 'echo', 'stereo_width'})
 
 class AdvancedAudioProcessor:
     """Advanced audio processing with professional-grade effects."""
@@ -18,9 +97,16 @@ class AdvancedAudioProcessor:
         self.sample_rate = config.get('sample_rate', 44100)
         self.channels = config.get('channels', 2)
         
+        # Optional FFTW backend for scipy.fft
+        configure_fft_backend(config, self.logger)
+        
         # Initialize effect parameters
         self.effects = config.get('effects', {})
         
+        # Block processing for long files (only used when every effect supports it)
+        self.streaming = config.get('streaming', False)
+        self.block_size = config.get('block_size', 65536)
+        
     def process_audio(self, input_path: str, output_path: str, effects: Optional[Dict] = None) -> str:
         """
         Process audio with advanced effects.
@@ -34,39 +120,115 @@ class AdvancedAudioProcessor:
             Path to processed audio file
         """
         try:
+            effects = effects or self.effects
+            if self._can_stream(input_path, effects):
+                return self._process_blocks(input_path, output_path, effects)
+                
             # Load audio
-            audio, sr = librosa.load(input_path, sr=self.sample_rate)
+            audio, sr = librosa.load(input_path, sr=self.sample_rate, dtype=np.float32)
             
             # Apply effects
-            if effects:
-                audio = self._apply_effects(audio, effects)
-            else:
-                audio = self._apply_effects(audio, self.effects)
+            audio = self._apply_effects(audio, effects)
             
             # Save processed audio
-            sf.write(output_path, audio, self.sample_rate)
+            sf.write(output_path, audio, self.sample_rate, subtype='FLOAT')
             return output_path
             
         except Exception as e:
             self.logger.error(f"Error processing audio: {str(e)}")
             raise
             
-    def _apply_effects(self, audio: np.ndarray, effects: Dict) -> np.ndarray:
-        """Apply multiple audio effects in sequence."""
+    def process_batch(self, input_paths: List[str], output_paths: List[str],
+                      effects: Optional[Dict] = None, max_workers: Optional[int] = None) -> List[str]:
+        """
+        Process many files in parallel worker processes.
+        
+        Args:
+            input_paths: Paths to input audio files
+            output_paths: Paths to save processed audio, matching input_paths
+            effects: Optional dictionary of effects to apply to every file
+            max_workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Paths to processed audio files, in input order
+        """
+        if len(input_paths) != len(output_paths):
+            raise ValueError("input_paths and output_paths must have the same length")
+        jobs = [(input_path, output_path, effects) for input_path, output_path in zip(input_paths, output_paths)]
+        
+        try:
+            return run_batch(AdvancedAudioProcessor, self.config, 'process_audio', jobs, max_workers)
+            
+        except Exception as e:
+            self.logger.error(f"Error batch processing audio: {str(e)}")
+            raise
+            
+    def _can_stream(self, input_path: str, effects: Dict) -> bool:
+        """Check whether a file can go through block processing."""
+        if not self.streaming:
+            return False
+        if any(value and name not in STREAMABLE_EFFECTS for name, value in effects.items()):
+            return False
+        return sf.info(input_path).samplerate == self.sample_rate
+        
+    def _process_blocks(self, input_path: str, output_path: str, effects: Dict) -> str:
+        """
+        Apply effects block by block, carrying filter and delay state across
+        blocks, and write each block while the next one is processed.
+        
+        Args:
+            input_path: Path to input audio file
+            output_path: Path to save processed audio
+            effects: Dictionary of streamable effects to apply
+            
+        Returns:
+            Path to processed audio file
+        """
+        state: Dict = {}
+        pending = None
+        
+        with sf.SoundFile(output_path, 'w', samplerate=self.sample_rate, channels=1, subtype='FLOAT') as out, \
+                ThreadPoolExecutor(max_workers=1) as writer:
+            for block in sf.blocks(input_path, blocksize=self.block_size, dtype='float32'):
+                # Downmix like librosa.load does
+                if block.ndim > 1:
+                    block = block.mean(axis=1)
+                    
+                block = self._apply_effects(block, effects, state)
+                
+                if pending is not None:
+                    pending.result()
+                pending = writer.submit(out.write, block)
+                
+            if pending is not None:
+                pending.result()
+                
+        return output_path
+        
+    def _apply_effects(self, audio: np.ndarray, effects: Dict, state: Optional[Dict] = None) -> np.ndarray:
+        """
+        Apply multiple audio effects in sequence.
+        
+        When state is given, audio is one block of a longer signal and each
+        stateful effect keeps its carry-over in state between calls.
+        """
+        def effect_state(name: str) -> Optional[Dict]:
+            return None if state is None else state.setdefault(name, {})
+            
         if effects.get('noise_reduction'):
             audio = self._reduce_noise(audio)
             
         if effects.get('equalization'):
-            audio = self._apply_eq(audio, effects['equalization'])
+            audio = self._apply_eq(audio, effects['equalization'], effect_state('equalization'))
             
         if effects.get('compression'):
-            audio = self._apply_compression(audio, effects['compression'])
+            audio = self._apply_compression(audio, effects['compression'], effect_state('compression'))
             
         if effects.get('reverb'):
-            audio = self._apply_reverb(audio, effects['reverb'])
+            audio = self._apply_reverb(audio, effects['reverb'], effect_state('reverb'))
             
         if effects.get('echo'):
-            audio = self._apply_echo(audio, effects['echo'])
+            audio = self._apply_echo(audio, effects['echo'], effect_state('echo'))
             
         if effects.get('pitch_shift'):
             audio = self._shift_pitch(audio, effects['pitch_shift'])
@@ -82,7 +244,7 @@ class AdvancedAudioProcessor:
     def _reduce_noise(self, audio: np.ndarray) -> np.ndarray:
         """Apply advanced noise reduction."""
         # Spectral gating
-        S = np.abs(librosa.stft(audio))
+        S = np.abs(stft_real(audio))
         S_db = librosa.amplitude_to_db(S)
         
         # Estimate noise floor
@@ -94,10 +256,17 @@ class AdvancedAudioProcessor:
         S_gated = librosa.db_to_amplitude(S_db_gated)
         
         # Reconstruct signal
-        return librosa.istft(S_gated)
+        return istft_real(S_gated, length=len(audio))
+        
+    def _apply_eq(self, audio: np.ndarray, eq_params: Dict, state: Optional[Dict] = None) -> np.ndarray:
+        """
+        Apply parametric equalization.
         
-    def _apply_eq(self, audio: np.ndarray, eq_params: Dict) -> np.ndarray:
-        """Apply parametric equalization."""
+        Whole signals are filtered zero-phase (sosfiltfilt), as before. Blocks
+        (state given) can't be filtered backwards, so they get the same
+        magnitude response from a forward-only cascade, which adds the filters'
+        phase shift. Streamed and in-memory output therefore differ slightly.
+        """
         bands = eq_params.get('bands', [
             {'freq': 60, 'gain': 0, 'q': 1.0},
             {'freq': 170, 'gain': 0, 'q': 1.0},
@@ -111,67 +280,96 @@ class AdvancedAudioProcessor:
             {'freq': 16000, 'gain': 0, 'q': 1.0}
         ])
         
-        # Apply each band
-        for band in bands:
-            b, a = self._design_peaking_filter(
-                band['freq'],
-                band['gain'],
-                band['q'],
-                self.sample_rate
-            )
-            audio = filtfilt(b, a, audio)
+        # Flat bands are identity filters, so leave them out of the cascade
+        key = tuple((band['freq'], band['gain'], band['q']) for band in bands if band['gain'] != 0)
+        if not key:
+            return audio
             
-        return audio
-        
-    def _apply_compression(self, audio: np.ndarray, params: Dict) -> np.ndarray:
+        sos = _eq_sos(key, self.sample_rate)
+        if state is None:
+            # Apply the whole cascade in one forward-backward pass
+            return sosfiltfilt(sos, audio).astype(np.float32, copy=False)
+            
+        # Blocks can't be filtered backwards; run the cascade twice forwards
+        # instead, which gives the same magnitude response as filtfilt
+        if 'zi' not in state:
+            state['sos'] = np.vstack([sos, sos])
+            state['zi'] = sosfilt_zi(state['sos']) * audio[0]
+        audio, state['zi'] = sosfilt(state['sos'], audio, zi=state['zi'])
+        return audio.astype(np.float32, copy=False)
+        
+    def _apply_compression(self, audio: np.ndarray, params: Dict, state: Optional[Dict] = None) -> np.ndarray:
         """Apply multi-band compression."""
         threshold = params.get('threshold', -20)
         ratio = params.get('ratio', 4.0)
         attack = params.get('attack', 0.003)
         release = params.get('release', 0.25)
         
-        # Convert to dB
-        audio_db = 20 * np.log10(np.abs(audio) + 1e-10)
+        slope = 1 - 1/ratio
+        audio = np.ascontiguousarray(audio)
         
-        # Calculate gain reduction
-        gain_reduction = np.zeros_like(audio_db)
-        mask = audio_db > threshold
-        gain_reduction[mask] = (audio_db[mask] - threshold) * (1 - 1/ratio)
+        # Start from the previous block's gain, or the first sample's target
+        if state is not None and 'gain' in state:
+            initial = state['gain']
+        else:
+            level = 20 * np.log10(abs(float(audio[0])) + 1e-10)
+            initial = max(level - threshold, 0.0) * slope
         
         # Apply attack/release
-        attack_samples = int(attack * self.sample_rate)
-        release_samples = int(release * self.sample_rate)
-        
-        # Smooth gain reduction
-        gain_reduction = self._smooth_gain_reduction(
-            gain_reduction,
-            attack_samples,
-            release_samples
-        )
+        attack_samples = max(int(attack * self.sample_rate), 1)
+        release_samples = max(int(release * self.sample_rate), 1)
         
-        # Apply gain reduction
-        audio = audio * np.power(10, -gain_reduction/20)
-        return audio
+        # Detect, smooth and apply gain reduction in a single pass
+        output = np.empty_like(audio)
+        final = _compress_kernel(
+            audio,
+            float(threshold),
+            float(slope),
+            float(initial),
+            1.0 / attack_samples,
+            1.0 / release_samples,
+            output
+        )
+        if state is not None:
+            state['gain'] = final
+        return output
         
-    def _apply_reverb(self, audio: np.ndarray, params: Dict) -> np.ndarray:
+    def _apply_reverb(self, audio: np.ndarray, params: Dict, state: Optional[Dict] = None) -> np.ndarray:
         """Apply convolution reverb."""
         room_size = params.get('room_size', 0.5)
         damping = params.get('damping', 0.5)
         wet_level = params.get('wet_level', 0.3)
         
-        # Generate impulse response
+        # Impulse response, pre-scaled by the wet level
         ir_length = int(room_size * self.sample_rate)
-        impulse_response = np.exp(-damping * np.arange(ir_length))
-        impulse_response = impulse_response / np.sum(impulse_response)
-        
-        # Apply convolution
-        reverb = signal.convolve(audio, impulse_response, mode='full')
+        impulse_response = _reverb_ir(ir_length, float(damping), float(wet_level))
+        
+        # Apply convolution; direct form wins for short kernels
+        if ir_length < 500:
+            reverb = np.convolve(audio, impulse_response, mode='full')
+        elif state is not None:
+            # Blocks share a size, so the IR spectrum is reused between them
+            n_out = len(audio) + ir_length - 1
+            n_fft = fft.next_fast_len(n_out, real=True)
+            spectrum = fft.rfft(audio, n=n_fft, workers=-1)
+            spectrum *= _reverb_ir_spectrum(ir_length, float(damping), float(wet_level), n_fft)
+            reverb = fft.irfft(spectrum, n=n_fft, workers=-1)[:n_out]
+        else:
+            reverb = signal.oaconvolve(audio, impulse_response, mode='full')
+            
+        # Carry the convolution tail into the next block
+        if state is not None:
+            tail = state.get('tail')
+            if tail is not None:
+                reverb[:len(tail)] += tail
+            state['tail'] = reverb[len(audio):]
         reverb = reverb[:len(audio)]
         
         # Mix with original
-        return (1 - wet_level) * audio + wet_level * reverb
+        reverb += (1 - wet_level) * audio
+        return reverb
         
-    def _apply_echo(self, audio: np.ndarray, params: Dict) -> np.ndarray:
+    def _apply_echo(self, audio: np.ndarray, params: Dict, state: Optional[Dict] = None) -> np.ndarray:
         """Apply multi-tap echo."""
         delay = params.get('delay', 0.3)
         feedback = params.get('feedback', 0.3)
@@ -179,12 +377,29 @@ class AdvancedAudioProcessor:
         
         delay_samples = int(delay * self.sample_rate)
         output = np.copy(audio)
+        gains = (feedback ** np.arange(1, taps + 1)).astype(np.float32)
+        
+        if state is not None:
+            # Read delayed samples from the previous blocks' history
+            history_length = max(delay_samples * taps, 0)
+            history = state.get('history')
+            if history is None:
+                history = np.zeros(history_length, dtype=np.float32)
+            extended = np.concatenate([history, audio])
+            for i in range(taps):
+                delay_amount = delay_samples * (i + 1)
+                if delay_amount <= 0:
+                    continue
+                start = history_length - delay_amount
+                output += extended[start:start + len(audio)] * gains[i]
+            state['history'] = extended[len(extended) - history_length:]
+            return output
         
         for i in range(taps):
             delay_amount = delay_samples * (i + 1)
-            delayed = np.roll(audio, delay_amount)
-            delayed[:delay_amount] = 0
-            output += delayed * (feedback ** (i + 1))
+            if delay_amount <= 0 or delay_amount >= len(audio):
+                continue
+            output[delay_amount:] += audio[:-delay_amount] * gains[i]
             
         return output
         
@@ -218,35 +433,7 @@ class AdvancedAudioProcessor:
         
     def _design_peaking_filter(self, freq: float, gain: float, q: float, fs: float) -> Tuple[np.ndarray, np.ndarray]:
         """Design a peaking filter."""
-        w0 = 2 * np.pi * freq / fs
-        alpha = np.sin(w0) / (2 * q)
-        
-        A = np.sqrt(10 ** (gain / 20))
-        
-        b0 = 1 + alpha * A
-        b1 = -2 * np.cos(w0)
-        b2 = 1 - alpha * A
-        a0 = 1 + alpha / A
-        a1 = -2 * np.cos(w0)
-        a2 = 1 - alpha / A
-        
-        return np.array([b0, b1, b2]), np.array([a0, a1, a2])
-        
-    def _smooth_gain_reduction(self, gain_reduction: np.ndarray, attack: int, release: int) -> np.ndarray:
-        """Smooth gain reduction with attack and release."""
-        smoothed = np.zeros_like(gain_reduction)
-        current_gain = gain_reduction[0]
-        
-        for i in range(len(gain_reduction)):
-            if gain_reduction[i] > current_gain:
-                # Attack phase
-                current_gain += (gain_reduction[i] - current_gain) / attack
-            else:
-                # Release phase
-                current_gain += (gain_reduction[i] - current_gain) / release
-            smoothed[i] = current_gain
-            
-        return smoothed
+        return _peaking_coeffs(freq, gain, q, fs)
         
     def get_audio_info(self, audio_path: str) -> Dict:
         """Get detailed information about an audio file."""
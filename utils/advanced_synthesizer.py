@@ -1,9 +1,107 @@
 import numpy as np
 import librosa
+import soundfile as sf
 from typing import Dict, Optional, Tuple, List
 import logging
+from functools import lru_cache
 from scipy import signal
 from scipy.signal import butter, filtfilt
+from utils.stft import configure_fft_backend, time_axis, stft_real, istft_real
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _modulate(audio, sample_rate, vibrato_rate, vibrato_depth, tremolo_rate, tremolo_depth):
+        """Apply tremolo and vibrato gain in a single pass over the samples."""
+        w_vibrato = 2 * np.pi * vibrato_rate / sample_rate
+        w_tremolo = 2 * np.pi * tremolo_rate / sample_rate
+        out = np.empty_like(audio)
+        for i in prange(audio.shape[0]):
+            out[i] = (audio[i]
+                      * (1 + tremolo_depth * np.sin(w_tremolo * i))
+                      * (1 + vibrato_depth * np.sin(w_vibrato * i)))
+        return out
+else:
+    def _modulate(audio, sample_rate, vibrato_rate, vibrato_depth, tremolo_rate, tremolo_depth):
+        """Apply tremolo and vibrato gain, reusing one scratch array."""
+        t = np.arange(len(audio), dtype=np.float32) / sample_rate
+        out = np.sin(2 * np.pi * tremolo_rate * t)
+        out *= tremolo_depth
+        out += 1
+        np.sin(2 * np.pi * vibrato_rate * t, out=t)
+        t *= vibrato_depth
+        t += 1
+        out *= t
+        out *= audio
+        return out
+
+def _time_stretch_varying(audio: np.ndarray, rates: np.ndarray,
+                          n_fft: int = 2048, hop_length: int = 512) -> np.ndarray:
+    """
+    Phase-vocoder time stretch with a rate per input STFT frame.
+    
+    Args:
+        audio: Mono audio signal
+        rates: Positive stretch rate at each input frame (>1 is faster)
+        n_fft: FFT size
+        hop_length: Samples between frames
+        
+    Returns:
+        Stretched audio
+    """
+    D = stft_real(audio, n_fft=n_fft, hop_length=hop_length)
+    n_frames = D.shape[1]
+    
+    # Output time reached at each input frame, inverted to get the
+    # (fractional) input frame read at each output frame
+    out_time = np.concatenate(([0.0], np.cumsum(1.0 / rates[:n_frames - 1])))
+    steps = np.interp(np.arange(0, out_time[-1] + 1), out_time, np.arange(n_frames))
+    
+    D = np.pad(D, [(0, 0), (0, 1)])
+    left = steps.astype(np.int64)
+    alpha = (steps - left).astype(np.float32)
+    mag = (1 - alpha) * np.abs(D[:, left]) + alpha * np.abs(D[:, left + 1])
+    
+    # Accumulate phase from the instantaneous frequency between neighbouring frames
+    phi_advance = np.linspace(0, np.pi * hop_length, D.shape[0])[:, np.newaxis]
+    dphase = np.angle(D[:, left + 1]) - np.angle(D[:, left]) - phi_advance
+    dphase -= 2 * np.pi * np.round(dphase / (2 * np.pi))
+    phase = np.cumsum(phi_advance + dphase, axis=1)
+    phase = np.angle(D[:, :1]) + np.concatenate((np.zeros_like(phase[:, :1]), phase[:, :-1]), axis=1)
+    
+    stretched = istft_real(mag * np.exp(1j * phase), hop_length=hop_length)
+    return stretched.astype(np.float32, copy=False)
+
+@lru_cache(maxsize=256)
+def _formant_coeffs(freq: float, bandwidth: float, fs: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Two-pole formant resonator coefficients, cached read-only."""
+    w0 = 2 * np.pi * freq / fs
+    alpha = np.sin(w0) * np.exp(-np.pi * bandwidth / fs)
+    
+    b0 = alpha
+    b1 = 0
+    b2 = -alpha
+    a0 = 1
+    a1 = -2 * np.cos(w0) * np.exp(-np.pi * bandwidth / fs)
+    a2 = np.exp(-2 * np.pi * bandwidth / fs)
+    
+    b, a = np.array([b0, b1, b2]), np.array([a0, a1, a2])
+    b.setflags(write=False)
+    a.setflags(write=False)
+    return b, a
+
+@lru_cache(maxsize=64)
+def _shaping_gains(sample_rate: int, n_fft: int, brightness: float, warmth: float, presence: float) -> np.ndarray:
+    """Per-bin gain for the warmth (<500 Hz), presence and brightness (>2 kHz) bands."""
+    freqs = librosa.fft_frequencies(sr=sample_rate, n_fft=n_fft)
+    gains = np.full(len(freqs), presence, dtype=np.float32)
+    gains[freqs < 500] = warmth
+    gains[freqs > 2000] = brightness
+    gains.setflags(write=False)
+    return gains
 
 class AdvancedSynthesizer:
     """Advanced voice synthesis with sophisticated manipulation capabilities."""
@@ -17,6 +115,11 @@ class AdvancedSynthesizer:
         self.frame_length = config.get('frame_length', 2048)
         self.hop_length = config.get('hop_length', 512)
         
+        # Optional FFTW backend for scipy.fft
+        configure_fft_backend(config, self.logger)
+        
+        self._rng = np.random.default_rng()
+        
     def synthesize_voice(self, 
                         text: str,
                         voice_params: Dict,
@@ -43,7 +146,7 @@ class AdvancedSynthesizer:
             audio = self._apply_prosody(audio, voice_params)
             
             # Save audio
-            librosa.output.write_wav(output_path, audio, self.sample_rate)
+            sf.write(output_path, audio, self.sample_rate, subtype='FLOAT')
             return output_path
             
         except Exception as e:
@@ -57,7 +160,7 @@ class AdvancedSynthesizer:
         duration = params.get('duration', 1.0)
         
         # Generate time array
-        t = np.arange(0, duration, 1/self.sample_rate)
+        t = time_axis(int(np.ceil(duration * self.sample_rate)), self.sample_rate)
         
         # Generate fundamental frequency
         f0 = pitch * np.ones_like(t)
@@ -120,28 +223,22 @@ class AdvancedSynthesizer:
         
     def _design_formant_filter(self, freq: float, bandwidth: float, fs: float) -> Tuple[np.ndarray, np.ndarray]:
         """Design a formant filter."""
-        w0 = 2 * np.pi * freq / fs
-        alpha = np.sin(w0) * np.exp(-np.pi * bandwidth / fs)
-        
-        b0 = alpha
-        b1 = 0
-        b2 = -alpha
-        a0 = 1
-        a1 = -2 * np.cos(w0) * np.exp(-np.pi * bandwidth / fs)
-        a2 = np.exp(-2 * np.pi * bandwidth / fs)
-        
-        return np.array([b0, b1, b2]), np.array([a0, a1, a2])
+        return _formant_coeffs(freq, bandwidth, fs)
         
     def _generate_excitation(self, t: np.ndarray, f0: np.ndarray) -> np.ndarray:
         """Generate excitation signal."""
         # Generate impulse train
-        impulse_train = np.zeros_like(t)
-        for i in range(len(t)):
-            if i % int(self.sample_rate / f0[i]) == 0:
-                impulse_train[i] = 1
+        if np.ptp(f0) == 0:
+            # Constant pitch: one impulse every period
+            impulse_train = np.zeros_like(t)
+            impulse_train[::max(int(self.sample_rate / f0[0]), 1)] = 1
+        else:
+            # Varying pitch: an impulse each time the accumulated phase wraps
+            phase = (np.cumsum(f0) - f0[0]) / self.sample_rate
+            impulse_train = (np.diff(np.floor(phase), prepend=-1) > 0).astype(t.dtype)
                 
         # Apply noise
-        noise = np.random.normal(0, 0.1, len(t))
+        noise = self._rng.standard_normal(len(t), dtype=np.float32) * 0.1
         
         return impulse_train + noise
         
@@ -153,29 +250,16 @@ class AdvancedSynthesizer:
         presence = params.get('presence', 1.0)
         
         # Compute STFT
-        D = librosa.stft(audio, n_fft=self.frame_length, hop_length=self.hop_length)
-        
-        # Get magnitude and phase
-        magnitude = np.abs(D)
-        phase = np.angle(D)
-        
-        # Apply spectral shaping
-        freqs = librosa.fft_frequencies(sr=self.sample_rate, n_fft=self.frame_length)
-        
-        # Brightness (high frequencies)
-        mask_bright = freqs > 2000
-        magnitude[mask_bright] *= brightness
-        
-        # Warmth (low frequencies)
-        mask_warm = freqs < 500
-        magnitude[mask_warm] *= warmth
+        D = stft_real(audio, n_fft=self.frame_length, hop_length=self.hop_length)
         
-        # Presence (mid frequencies)
-        mask_presence = (freqs >= 500) & (freqs <= 2000)
-        magnitude[mask_presence] *= presence
+        # Apply spectral shaping with one per-bin gain; the gain is real,
+        # so scaling D in place leaves the phase untouched
+        gains = _shaping_gains(self.sample_rate, self.frame_length,
+                               float(brightness), float(warmth), float(presence))
+        D *= gains[:, np.newaxis]
         
         # Reconstruct
-        return librosa.istft(magnitude * np.exp(1j * phase), hop_length=self.hop_length)
+        return istft_real(D, hop_length=self.hop_length, length=len(audio))
         
     def _apply_temporal_shaping(self, audio: np.ndarray, params: Dict) -> np.ndarray:
         """Apply temporal shaping to voice."""
@@ -183,17 +267,11 @@ class AdvancedSynthesizer:
         attack = params.get('attack', 0.01)
         release = params.get('release', 0.1)
         
-        # Generate envelope
-        t = np.arange(len(audio)) / self.sample_rate
-        envelope = np.ones_like(t)
-        
-        # Apply attack
-        mask_attack = t < attack
-        envelope[mask_attack] = t[mask_attack] / attack
-        
-        # Apply release
-        mask_release = t > (t[-1] - release)
-        envelope[mask_release] = (t[-1] - t[mask_release]) / release
+        # Generate envelope: linear attack ramp, linear release ramp, 1 between
+        t = time_axis(len(audio), self.sample_rate)
+        envelope = t / max(attack, 1 / self.sample_rate)
+        np.minimum(envelope, (t[-1] - t) / max(release, 1 / self.sample_rate), out=envelope)
+        np.minimum(envelope, 1, out=envelope)
         
         return audio * envelope
         
@@ -205,49 +283,66 @@ class AdvancedSynthesizer:
         tremolo_rate = params.get('tremolo_rate', 6.0)
         tremolo_depth = params.get('tremolo_depth', 0.3)
         
-        # Generate time array
-        t = np.arange(len(audio)) / self.sample_rate
-        
-        # Generate vibrato
-        vibrato = np.sin(2 * np.pi * vibrato_rate * t) * vibrato_depth
-        
-        # Generate tremolo
-        tremolo = 1 + np.sin(2 * np.pi * tremolo_rate * t) * tremolo_depth
-        
         # Apply modulation
-        return audio * tremolo * (1 + vibrato)
+        return _modulate(audio, self.sample_rate,
+                         vibrato_rate, vibrato_depth,
+                         tremolo_rate, tremolo_depth)
         
     def _apply_pitch_contour(self, audio: np.ndarray, params: Dict) -> np.ndarray:
-        """Apply pitch contour to voice."""
+        """
+        Apply pitch contour to voice.
+        
+        pitch_contour holds pitch shifts in semitones, spread evenly over the
+        signal and interpolated between points.
+        """
         # Get pitch parameters
         pitch_contour = params.get('pitch_contour', [1.0])
         
         # Generate time array
-        t = np.arange(len(audio)) / self.sample_rate
+        t = time_axis(len(audio), self.sample_rate)
         
         # Interpolate pitch contour
         pitch = np.interp(t, np.linspace(0, t[-1], len(pitch_contour)), pitch_contour)
         
-        # Apply pitch shift
-        return librosa.effects.pitch_shift(
-            audio,
-            sr=self.sample_rate,
-            n_steps=pitch
-        )
+        # Shift by the mean once, as a scalar
+        mean_steps = float(np.mean(pitch))
+        if mean_steps != 0.0:
+            audio = librosa.effects.pitch_shift(
+                audio,
+                sr=self.sample_rate,
+                n_steps=mean_steps
+            )
+            
+        # Follow the remaining variation with a time-varying read position
+        if np.ptp(pitch) > 0:
+            ratio = np.exp2((pitch - mean_steps) / 12)
+            n = np.arange(len(audio), dtype=np.float64)
+            idx = n + np.cumsum(ratio - 1)
+            np.clip(idx, 0, len(audio) - 1, out=idx)
+            audio = np.interp(idx, n, audio).astype(np.float32)
+            
+        return audio
         
     def _apply_timing(self, audio: np.ndarray, params: Dict) -> np.ndarray:
-        """Apply timing variations."""
-        # Get timing parameters
-        timing = params.get('timing', [1.0])
-        
-        # Generate time array
-        t = np.arange(len(audio)) / self.sample_rate
-        
-        # Interpolate timing
-        rate = np.interp(t, np.linspace(0, t[-1], len(timing)), timing)
+        """
+        Apply timing variations.
         
-        # Apply time stretch
-        return librosa.effects.time_stretch(audio, rate=rate)
+        timing holds time-stretch rates (>1 is faster), spread evenly over
+        the signal and interpolated between points.
+        """
+        # Get timing parameters
+        timing = np.asarray(params.get('timing', [1.0]), dtype=np.float64)
+        if np.any(timing <= 0):
+            raise ValueError("Timing rates must be positive")
+        if np.all(timing == 1.0):
+            return audio
+        if np.ptp(timing) == 0:
+            return librosa.effects.time_stretch(audio, rate=float(timing[0]))
+        
+        # Interpolate timing at each STFT frame and stretch frame by frame
+        n_frames = 1 + len(audio) // self.hop_length
+        rate = np.interp(np.arange(n_frames), np.linspace(0, n_frames - 1, len(timing)), timing)
+        return _time_stretch_varying(audio, rate, n_fft=self.frame_length, hop_length=self.hop_length)
         
     def _apply_stress(self, audio: np.ndarray, params: Dict) -> np.ndarray:
         """Apply stress patterns."""
@@ -255,10 +350,10 @@ class AdvancedSynthesizer:
         stress = params.get('stress', [1.0])
         
         # Generate time array
-        t = np.arange(len(audio)) / self.sample_rate
+        t = time_axis(len(audio), self.sample_rate)
         
         # Interpolate stress
-        gain = np.interp(t, np.linspace(0, t[-1], len(stress)), stress)
+        gain = np.interp(t, np.linspace(0, t[-1], len(stress)), stress).astype(np.float32)
         
         # Apply stress
         return audio * gain 
\ No newline at end of file
@@ -4,8 +4,38 @@ import soundfile as sf
 import librosa
 from typing import Dict, Optional, List, Tuple
 import logging
+from functools import lru_cache
 from scipy import signal
+from scipy import fft
+from scipy.linalg import solve_toeplitz
 from scipy.signal import butter, filtfilt
+from utils.stft import configure_fft_backend, time_axis, stft_real, istft_real
+from utils.batch import run_batch
+
+@lru_cache(maxsize=256)
+def _resonant_coeffs(freq: float, resonance: float, fs: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Band-pass resonator biquad coefficients, cached read-only."""
+    w0 = 2 * np.pi * freq / fs
+    alpha = np.sin(w0) / (2 * resonance)
+    
+    b0 = alpha
+    b1 = 0
+    b2 = -alpha
+    a0 = 1 + alpha
+    a1 = -2 * np.cos(w0)
+    a2 = 1 - alpha
+    
+    b, a = np.array([b0, b1, b2]), np.array([a0, a1, a2])
+    b.setflags(write=False)
+    a.setflags(write=False)
+    return b, a
+
+def _autocorrelation(audio: np.ndarray, n_lags: int) -> np.ndarray:
+    """First n_lags autocorrelation lags via FFT, zero-padded to avoid circular wrap."""
+    # irfft must invert at the forward size; next_fast_len can be odd
+    n_fft = fft.next_fast_len(2 * len(audio) - 1)
+    spectrum = fft.rfft(audio, n=n_fft, workers=-1)
+    return fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n=n_fft)[:n_lags].astype(np.float64)
 
 class AdvancedVoiceProcessor:
     """Advanced voice processing with sophisticated manipulation capabilities."""
@@ -19,6 +49,13 @@ class AdvancedVoiceProcessor:
         self.frame_length = config.get('frame_length', 2048)
         self.hop_length = config.get('hop_length', 512)
         
+        # Optional FFTW backend for scipy.fft
+        configure_fft_backend(config, self.logger)
+        
+        # Noise source for breathiness; the scratch buffer only ever grows
+        self._rng = np.random.default_rng()
+        self._noise_scratch = np.empty(0, dtype=np.float32)
+        
     def process_voice(self, input_path: str, output_path: str, effects: Optional[Dict] = None) -> str:
         """
         Process voice with advanced effects.
@@ -33,20 +70,45 @@ class AdvancedVoiceProcessor:
         """
         try:
             # Load audio
-            audio, sr = librosa.load(input_path, sr=self.sample_rate)
+            audio, sr = librosa.load(input_path, sr=self.sample_rate, dtype=np.float32)
             
             # Apply effects
             if effects:
                 audio = self._apply_voice_effects(audio, effects)
             
             # Save processed audio
-            sf.write(output_path, audio, self.sample_rate)
+            sf.write(output_path, audio, self.sample_rate, subtype='FLOAT')
             return output_path
             
         except Exception as e:
             self.logger.error(f"Error processing voice: {str(e)}")
             raise
             
+    def process_batch(self, input_paths: List[str], output_paths: List[str],
+                      effects: Optional[Dict] = None, max_workers: Optional[int] = None) -> List[str]:
+        """
+        Process many files in parallel worker processes.
+        
+        Args:
+            input_paths: Paths to input audio files
+            output_paths: Paths to save processed audio, matching input_paths
+            effects: Optional dictionary of effects to apply to every file
+            max_workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Paths to processed audio files, in input order
+        """
+        if len(input_paths) != len(output_paths):
+            raise ValueError("input_paths and output_paths must have the same length")
+        jobs = [(input_path, output_path, effects) for input_path, output_path in zip(input_paths, output_paths)]
+        
+        try:
+            return run_batch(AdvancedVoiceProcessor, self.config, 'process_voice', jobs, max_workers)
+            
+        except Exception as e:
+            self.logger.error(f"Error batch processing voice: {str(e)}")
+            raise
+            
     def _apply_voice_effects(self, audio: np.ndarray, effects: Dict) -> np.ndarray:
         """Apply multiple voice effects in sequence."""
         if effects.get('formant_shift'):
@@ -74,58 +136,62 @@ class AdvancedVoiceProcessor:
         shift_factor = params.get('shift_factor', 1.0)
         
         # Compute STFT
-        D = librosa.stft(audio, n_fft=self.frame_length, hop_length=self.hop_length)
+        D = stft_real(audio, n_fft=self.frame_length, hop_length=self.hop_length)
         
         # Shift formants
+        src_idx = np.arange(D.shape[0])
+        dst_idx = (src_idx * shift_factor).astype(np.intp)
+        mask = dst_idx < D.shape[0]
         D_shifted = np.zeros_like(D)
-        for i in range(D.shape[0]):
-            new_idx = int(i * shift_factor)
-            if new_idx < D.shape[0]:
-                D_shifted[new_idx] = D[i]
+        D_shifted[dst_idx[mask]] = D[src_idx[mask]]
                 
         # Inverse STFT
-        return librosa.istft(D_shifted, hop_length=self.hop_length)
+        return istft_real(D_shifted, hop_length=self.hop_length, length=len(audio))
         
     def _adjust_vocal_range(self, audio: np.ndarray, params: Dict) -> np.ndarray:
         """Adjust vocal range while preserving formants."""
         range_factor = params.get('range_factor', 1.0)
+        if range_factor == 1.0:
+            return audio
         
         # Compute STFT
-        D = librosa.stft(audio, n_fft=self.frame_length, hop_length=self.hop_length)
-        
-        # Get phase and magnitude
-        magnitude = np.abs(D)
-        phase = np.angle(D)
-        
-        # Adjust magnitude
-        magnitude_adjusted = magnitude ** range_factor
+        D = stft_real(audio, n_fft=self.frame_length, hop_length=self.hop_length)
         
-        # Reconstruct
-        D_adjusted = magnitude_adjusted * np.exp(1j * phase)
+        # |D| ** range_factor with the phase kept is D * |D| ** (range_factor - 1)
+        gain = np.abs(D)
+        np.maximum(gain, 1e-12, out=gain)
+        np.power(gain, range_factor - 1, out=gain)
+        D *= gain
         
         # Inverse STFT
-        return librosa.istft(D_adjusted, hop_length=self.hop_length)
+        return istft_real(D, hop_length=self.hop_length, length=len(audio))
         
     def _adjust_breathiness(self, audio: np.ndarray, params: Dict) -> np.ndarray:
         """Adjust breathiness of voice."""
         breathiness = params.get('amount', 0.5)
+        if breathiness < 1e-6:
+            return audio
         
         # Compute STFT
-        D = librosa.stft(audio, n_fft=self.frame_length, hop_length=self.hop_length)
+        D = stft_real(audio, n_fft=self.frame_length, hop_length=self.hop_length)
         
-        # Get magnitude and phase
         magnitude = np.abs(D)
-        phase = np.angle(D)
         
-        # Add noise to magnitude
-        noise = np.random.normal(0, breathiness, magnitude.shape)
-        magnitude_noisy = magnitude + noise
+        # Noise to add to the magnitude
+        if self._noise_scratch.size < magnitude.size:
+            self._noise_scratch = np.empty(magnitude.size, dtype=np.float32)
+        noise = self._noise_scratch[:magnitude.size].reshape(magnitude.shape)
+        self._rng.standard_normal(dtype=np.float32, out=noise)
+        noise *= breathiness
         
-        # Reconstruct
-        D_noisy = magnitude_noisy * np.exp(1j * phase)
+        # Scale D by (|D| + noise) / |D| so the phase is kept
+        np.maximum(magnitude, 1e-12, out=magnitude)
+        np.divide(noise, magnitude, out=noise)
+        noise += 1
+        D *= noise
         
         # Inverse STFT
-        return librosa.istft(D_noisy, hop_length=self.hop_length)
+        return istft_real(D, hop_length=self.hop_length, length=len(audio))
         
     def _adjust_resonance(self, audio: np.ndarray, params: Dict) -> np.ndarray:
         """Adjust vocal resonance."""
@@ -143,16 +209,16 @@ class AdvancedVoiceProcessor:
         rate = params.get('rate', 5.0)
         depth = params.get('depth', 0.5)
         
-        # Generate vibrato modulation
-        t = np.arange(len(audio)) / self.sample_rate
-        modulation = depth * np.sin(2 * np.pi * rate * t)
+        # Read through the signal with a sinusoidally varying delay; the
+        # delay's slope is the instantaneous pitch ratio minus one
+        deviation = 2 ** (depth / 12) - 1
+        n = np.arange(len(audio), dtype=np.float64)
+        t = n / self.sample_rate
+        idx = n + deviation * self.sample_rate / (2 * np.pi * rate) * np.sin(2 * np.pi * rate * t)
+        np.clip(idx, 0, len(audio) - 1, out=idx)
         
         # Apply modulation
-        return librosa.effects.pitch_shift(
-            audio,
-            sr=self.sample_rate,
-            n_steps=modulation
-        )
+        return np.interp(idx, n, audio).astype(np.float32)
         
     def _add_tremolo(self, audio: np.ndarray, params: Dict) -> np.ndarray:
         """Add tremolo effect."""
@@ -160,7 +226,7 @@ class AdvancedVoiceProcessor:
         depth = params.get('depth', 0.5)
         
         # Generate tremolo modulation
-        t = np.arange(len(audio)) / self.sample_rate
+        t = time_axis(len(audio), self.sample_rate)
         modulation = 1 + depth * np.sin(2 * np.pi * rate * t)
         
         # Apply modulation
@@ -168,17 +234,7 @@ class AdvancedVoiceProcessor:
         
     def _design_resonant_filter(self, freq: float, resonance: float, fs: float) -> Tuple[np.ndarray, np.ndarray]:
         """Design a resonant filter."""
-        w0 = 2 * np.pi * freq / fs
-        alpha = np.sin(w0) / (2 * resonance)
-        
-        b0 = alpha
-        b1 = 0
-        b2 = -alpha
-        a0 = 1 + alpha
-        a1 = -2 * np.cos(w0)
-        a2 = 1 - alpha
-        
-        return np.array([b0, b1, b2]), np.array([a0, a1, a2])
+        return _resonant_coeffs(freq, resonance, fs)
         
     def analyze_voice(self, audio_path: str) -> Dict:
         """Analyze voice characteristics."""
@@ -215,8 +271,14 @@ class AdvancedVoiceProcessor:
             
     def _estimate_formants(self, audio: np.ndarray) -> List[float]:
         """Estimate formant frequencies."""
-        # Compute LPC coefficients
-        lpc_coeffs = librosa.lpc(audio, order=8)
+        order = 8
+        
+        autocorr = _autocorrelation(audio, order + 1)
+        if autocorr[0] <= 0:
+            return []
+            
+        # Compute LPC coefficients (Levinson-Durbin on the Toeplitz system)
+        lpc_coeffs = np.concatenate(([1.0], solve_toeplitz(autocorr[:order], -autocorr[1:])))
         
         # Find roots of LPC polynomial
         roots = np.roots(lpc_coeffs)
@@ -1,11 +1,14 @@
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 import soundfile as sf
 import librosa
+import soxr
 import noisereduce as nr
 from pysndfx import AudioEffectsChain
 import logging
+from utils.spectral_processor import SpectralProcessor
+from utils.batch import run_batch
 
 class AudioProcessor:
     """Advanced audio processing utilities."""
@@ -18,9 +21,15 @@ class AudioProcessor:
         self.noise_reduction = config.get('noise_reduction', {})
         self.normalization = config.get('normalization', {})
         self.effects = config.get('effects', {})
+        self.spectral = config.get('spectral', {})
         self.output_format = config.get('output_format', 'mp3')
         self.sample_rate = config.get('sample_rate', 44100)
         self.channels = config.get('channels', 2)
+        
+        # Spectral effects share one STFT with noise reduction when both are enabled
+        self.spectral_processor = None
+        if self.spectral.get('enabled', False):
+            self.spectral_processor = SpectralProcessor({**self.spectral, 'sample_rate': self.sample_rate})
 
     def process_audio(self, input_path: str, output_path: str) -> str:
         """
@@ -35,10 +44,12 @@ class AudioProcessor:
         """
         try:
             # Load audio
-            audio, sr = librosa.load(input_path, sr=self.sample_rate)
+            audio, sr = self._load_audio(input_path)
             
-            # Apply noise reduction if enabled
-            if self.noise_reduction.get('enabled', False):
+            # Apply noise reduction and spectral effects if enabled
+            if self.spectral_processor is not None:
+                audio = self._apply_spectral_processing(audio)
+            elif self.noise_reduction.get('enabled', False):
                 audio = self._apply_noise_reduction(audio, sr)
             
             # Apply normalization if enabled
@@ -49,8 +60,11 @@ class AudioProcessor:
             if self.effects.get('enabled', False):
                 audio = self._apply_effects(audio, sr)
             
-            # Save processed audio
-            sf.write(output_path, audio, sr)
+            # Save processed audio in one contiguous float32 write
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+            file_format = os.path.splitext(output_path)[1][1:].upper()
+            subtype = 'PCM_16' if sf.check_format(file_format, 'PCM_16') else None
+            sf.write(output_path, audio, sr, subtype=subtype)
             
             return output_path
             
@@ -58,6 +72,30 @@ class AudioProcessor:
             self.logger.error(f"Error processing audio: {str(e)}")
             raise
 
+    def process_batch(self, input_paths: List[str], output_paths: List[str],
+                      max_workers: Optional[int] = None) -> List[str]:
+        """
+        Process many files in parallel worker processes.
+        
+        Args:
+            input_paths: Paths to input audio files
+            output_paths: Paths to save processed audio, matching input_paths
+            max_workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Paths to processed audio files, in input order
+        """
+        if len(input_paths) != len(output_paths):
+            raise ValueError("input_paths and output_paths must have the same length")
+        jobs = list(zip(input_paths, output_paths))
+        
+        try:
+            return run_batch(AudioProcessor, self.config, 'process_audio', jobs, max_workers)
+            
+        except Exception as e:
+            self.logger.error(f"Error batch processing audio: {str(e)}")
+            raise
+
     def _apply_noise_reduction(self, audio: np.ndarray, sr: int) -> np.ndarray:
         """Apply noise reduction to audio."""
         strength = self.noise_reduction.get('strength', 0.5)
@@ -67,12 +105,38 @@ class AudioProcessor:
             prop_decrease=strength
         )
 
+    def _load_audio(self, input_path: str) -> Tuple[np.ndarray, int]:
+        """Load audio as mono float32 at the configured sample rate."""
+        try:
+            audio, sr = sf.read(input_path, dtype='float32', always_2d=False)
+        except RuntimeError:
+            # Formats libsndfile cannot decode go through librosa's audioread fallback
+            audio, sr = librosa.load(input_path, sr=self.sample_rate, dtype=np.float32)
+            return audio, sr
+            
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        if sr != self.sample_rate:
+            audio = soxr.resample(audio, sr, self.sample_rate, quality='HQ')
+        return audio, self.sample_rate
+
+    def _apply_spectral_processing(self, audio: np.ndarray) -> np.ndarray:
+        """Apply spectral effects, fusing in noise reduction on the same STFT."""
+        effects = self.spectral.get('effects', {})
+        if not self.noise_reduction.get('enabled', False):
+            return self.spectral_processor.process_spectrum(audio, effects)
+        return self.spectral_processor.process_spectrum_with_noise_gate(
+            audio,
+            prop_decrease=self.noise_reduction.get('strength', 0.5),
+            effects=effects
+        )
+
     def _apply_normalization(self, audio: np.ndarray) -> np.ndarray:
         """Apply audio normalization."""
         target_level = self.normalization.get('target_level', -14)
         current_level = librosa.amplitude_to_db(np.abs(audio)).mean()
-        gain = target_level - current_level
-        return audio * (10 ** (gain / 20))
+        gain = np.float32(10.0 ** ((target_level - current_level) / 20.0))
+        return np.multiply(audio, gain, out=audio)
 
     def _apply_effects(self, audio: np.ndarray, sr: int) -> np.ndarray:
         """Apply audio effects chain."""
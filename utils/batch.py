@@ -0,0 +1,50 @@
+"""Process-pool batch runner shared by the audio and voice processors"""
+
+import os
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Per-process instance built once by the pool initializer
+_worker_instance = None
+
+def _init_worker(cls: type, config: Dict) -> None:
+    """Build the processor once per worker process."""
+    global _worker_instance
+    _worker_instance = cls(config)
+
+def _run_job(method: str, args: Tuple) -> Any:
+    """Call one method on the worker's processor with a job's arguments."""
+    return getattr(_worker_instance, method)(*args)
+
+def run_batch(cls: type, config: Dict, method: str, jobs: Iterable[Tuple],
+              max_workers: Optional[int] = None) -> List[Any]:
+    """
+    Run cls(config).method(*job) for every job in spawn-context worker processes.
+    
+    The config is sent once per worker through the pool initializer, so only
+    the job tuples are pickled per task.
+    
+    Args:
+        cls: Processor class, constructed from config in each worker
+        config: Configuration dictionary for cls
+        method: Name of the method to call for each job
+        jobs: Argument tuples, one per call
+        max_workers: Number of worker processes (defaults to the CPU count)
+        
+    Returns:
+        Return values of the calls, in job order
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+        
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (4 * max_workers))
+    
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=mp.get_context('spawn'),
+                             initializer=_init_worker,
+                             initargs=(cls, config)) as executor:
+        return list(executor.map(_run_job, repeat(method), jobs, chunksize=chunksize))
@@ -1,25 +1,79 @@
 """Configuration Manager for Universal TTS System"""
 
 import os
+import atexit
+import copy
+import weakref
 import yaml
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from utils.exceptions import ConfigurationError
 
+_MISSING = object()
+
+# Managers with deferred writes, flushed once at interpreter exit. A WeakSet
+# so registering doesn't keep a manager alive until then
+_deferred_managers: "weakref.WeakSet[ConfigManager]" = weakref.WeakSet()
+
+@atexit.register
+def _flush_deferred() -> None:
+    """Write pending changes of every live manager with deferred writes"""
+    for manager in list(_deferred_managers):
+        manager.flush()
+
 class ConfigManager:
-    """Configuration manager for the TTS system"""
+    """
+    Configuration manager for the TTS system.
+    
+    By default set() and update() write the config file immediately. With
+    defer_writes=True they only mark the config dirty; pending changes are
+    written by flush(), and by an exit hook for managers still alive then.
+    """
     
-    def __init__(self, config_dir: str = "config"):
+    # Parsed config files keyed by path, valid while (mtime_ns, size) match
+    _parse_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+    
+    def __init__(self, config_dir: str = "config", defer_writes: bool = False):
         self.config_dir = Path(config_dir)
         self.config_dir.mkdir(exist_ok=True)
         self.config_file = self.config_dir / "config.yaml"
         self.config: Dict[str, Any] = {}
+        
+        # Resolved dotted-key lookups and split keys; cleared whenever config changes
+        self._get_cache: Dict[str, Any] = {}
+        self._split_cache: Dict[str, Tuple[str, ...]] = {}
+        
+        # With deferred writes, set()/update() only mark the config dirty
+        self.defer_writes = defer_writes
+        self._dirty = False
+        if defer_writes:
+            _deferred_managers.add(self)
+    
+    def _file_key(self) -> Tuple[int, int]:
+        """Identify the current contents of the config file."""
+        st = self.config_file.stat()
+        return st.st_mtime_ns, st.st_size
+    
+    def _read_config_file(self) -> Any:
+        """Parse the config file, reusing the last parse if it hasn't changed"""
+        key = self._file_key()
+        cached = self._parse_cache.get(self.config_file)
+        if cached is None or cached[0] != key:
+            with open(self.config_file, 'r') as f:
+                cached = (key, yaml.load(f, Loader=_Loader))
+            self._parse_cache[self.config_file] = cached
+        return copy.deepcopy(cached[1])
     
     def load_config(self) -> None:
         """Load configuration from file"""
+        self._get_cache.clear()
         if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = self._read_config_file()
+            self._dirty = False
         else:
             # Create default configuration
             self.config = {
@@ -61,34 +115,65 @@ class ConfigManager:
     def save_config(self) -> None:
         """Save configuration to file"""
         with open(self.config_file, 'w') as f:
-            yaml.dump(self.config, f, default_flow_style=False)
+            yaml.dump(self.config, f, Dumper=_Dumper, default_flow_style=False)
+        self._parse_cache[self.config_file] = (self._file_key(), copy.deepcopy(self.config))
+        self._dirty = False
+    
+    def flush(self) -> None:
+        """Write pending set()/update() changes to file"""
+        if self._dirty:
+            self.save_config()
+    
+    def _split(self, key: str) -> Tuple[str, ...]:
+        """Split a dotted key, reusing earlier splits"""
+        keys = self._split_cache.get(key)
+        if keys is None:
+            keys = self._split_cache[key] = tuple(key.split('.'))
+        return keys
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
-        keys = key.split('.')
+        value = self._get_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+            
+        keys = self._split(key)
         value = self.config
+        found = True
         for k in keys:
             if isinstance(value, dict):
+                if k not in value:
+                    found = False
                 value = value.get(k, default)
             else:
                 return default
+                
+        # Only fully resolved paths are cached; misses depend on default
+        if found:
+            self._get_cache[key] = value
         return value
     
     def set(self, key: str, value: Any) -> None:
         """Set configuration value"""
-        keys = key.split('.')
+        self._get_cache.clear()
+        keys = self._split(key)
         config = self.config
         for k in keys[:-1]:
             if k not in config:
                 config[k] = {}
             config = config[k]
         config[keys[-1]] = value
-        self.save_config()
+        self._dirty = True
+        if not self.defer_writes:
+            self.flush()
     
     def update(self, config_dict: Dict[str, Any]) -> None:
         """Update multiple configuration values"""
+        self._get_cache.clear()
         self.config.update(config_dict)
-        self.save_config()
+        self._dirty = True
+        if not self.defer_writes:
+            self.flush()
 
     def _load_config(self) -> None:
         """Load configuration from YAML file and environment variables."""
@@ -121,17 +206,17 @@ class ConfigManager:
 
             # Try to load from config file
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    file_config = yaml.safe_load(f)
-                    if file_config:
-                        self._merge_configs(default_config, file_config)
-                    else:
-                        self.config = default_config
+                file_config = self._read_config_file()
+                if file_config:
+                    self._merge_configs(default_config, file_config)
+                else:
+                    self.config = default_config
             else:
                 self.config = default_config
 
             # Override with environment variables
             self._load_env_vars()
+            self._get_cache.clear()
 
         except Exception as e:
             raise ConfigurationError(f"Failed to load configuration: {str(e)}")
@@ -37,16 +37,19 @@ class LocalVoiceCloner:
         """
         try:
             # Load and process reference audio
-            audio, sr = sf.read(reference_audio)
+            audio, sr = sf.read(reference_audio, dtype='float32')
             
-            # Extract voice embeddings
-            embeddings = self.tts.speaker_encoder.forward(torch.from_numpy(audio).float())
+            # Extract voice embeddings on the encoder's device and keep them there
+            encoder = self.tts.speaker_encoder
+            device = next(encoder.parameters()).device
+            with torch.inference_mode():
+                embeddings = encoder(torch.from_numpy(audio).to(device))
             
             # Store voice data
             self.voice_samples[voice_name] = {
                 'audio': audio,
                 'sample_rate': sr,
-                'embeddings': embeddings.detach().numpy()
+                'embeddings': embeddings
             }
             
             return {
@@ -136,10 +139,10 @@ class LocalVoiceCloner:
             if len(weights) != len(voice_names):
                 raise ValueError("Number of weights must match number of voices")
             
-            # Mix embeddings
-            mixed_embedding = np.zeros_like(self.voice_samples[voice_names[0]]['embeddings'])
-            for name, weight in zip(voice_names, weights):
-                mixed_embedding += weight * self.voice_samples[name]['embeddings']
+            # Mix embeddings as one weighted sum on the embeddings' device
+            embeddings = torch.stack([self.voice_samples[name]['embeddings'] for name in voice_names])
+            w = torch.as_tensor(weights, device=embeddings.device, dtype=embeddings.dtype)
+            mixed_embedding = (w @ embeddings.reshape(len(voice_names), -1)).reshape(embeddings.shape[1:])
             
             # Store mixed voice
             if output_voice_name:
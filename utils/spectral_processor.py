@@ -1,9 +1,76 @@
+import math
 import numpy as np
 import librosa
 from typing import Dict, Optional, Tuple, List
 import logging
+from functools import lru_cache
 from scipy import signal
 from scipy.signal import butter, filtfilt
+from scipy.ndimage import uniform_filter1d
+from utils.stft import stft_real, istft_real
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+try:
+    import torch
+except ImportError:
+    torch = None
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _smooth_gain_reduction_nb(gain, inv_attack, inv_release, out):
+        """Attack/release follower along time (axis 1), one bin per thread."""
+        for b in prange(gain.shape[0]):
+            current = gain[b, 0]
+            for i in range(gain.shape[1]):
+                diff = gain[b, i] - current
+                current += diff * (inv_attack if diff > 0 else inv_release)
+                out[b, i] = current
+        return out
+else:
+    def _smooth_gain_reduction_nb(gain, inv_attack, inv_release, out):
+        """Attack/release follower along time (axis 1), vectorized across bins."""
+        current = gain[:, 0].copy()
+        for i in range(gain.shape[1]):
+            diff = gain[:, i] - current
+            current += diff * np.where(diff > 0, inv_attack, inv_release)
+            out[:, i] = current
+        return out
+
+# dB <-> linear amplitude factors for exp/log based conversion
+_DB_PER_NEPER = 20.0 / math.log(10.0)
+_NEPER_PER_DB = math.log(10.0) / 20.0
+
+def _amplitude_to_db(magnitude: np.ndarray, amin: float = 1e-5, top_db: float = 80.0) -> np.ndarray:
+    """librosa.amplitude_to_db(magnitude) with ref=1.0, without the copies."""
+    magnitude_db = np.maximum(magnitude, amin)
+    np.log(magnitude_db, out=magnitude_db)
+    magnitude_db *= _DB_PER_NEPER
+    return np.maximum(magnitude_db, magnitude_db.max() - top_db, out=magnitude_db)
+
+@lru_cache(maxsize=64)
+def _band_bins(sample_rate: int, n_fft: int,
+               edges: Tuple[Tuple[float, float], ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """First and one-past-last FFT bin of each (freq_low, freq_high) band."""
+    freqs = librosa.fft_frequencies(sr=sample_rate, n_fft=n_fft)
+    idx_low = np.searchsorted(freqs, [freq_low for freq_low, _ in edges])
+    idx_high = np.searchsorted(freqs, [freq_high for _, freq_high in edges])
+    idx_low.setflags(write=False)
+    idx_high.setflags(write=False)
+    return idx_low, idx_high
+
+@lru_cache(maxsize=64)
+def _band_gain_vector(sample_rate: int, n_fft: int,
+                      bands: Tuple[Tuple[float, float, float], ...],
+                      shape_factor: float) -> np.ndarray:
+    """Per-bin shaping gain for (freq_low, freq_high, gain) bands."""
+    idx_low, idx_high = _band_bins(sample_rate, n_fft, tuple((lo, hi) for lo, hi, _ in bands))
+    gains = np.ones(n_fft // 2 + 1, dtype=np.float32)
+    for lo, hi, (_, _, gain) in zip(idx_low, idx_high, bands):
+        gains[lo:hi] *= gain ** shape_factor
+    gains.setflags(write=False)
+    return gains
 
 class SpectralProcessor:
     """Advanced spectral processing with sophisticated manipulation capabilities."""
@@ -17,6 +84,27 @@ class SpectralProcessor:
         self.frame_length = config.get('frame_length', 2048)
         self.hop_length = config.get('hop_length', 512)
         
+        # FFT bin frequencies are fixed for the lifetime of the processor
+        self._fft_freqs = librosa.fft_frequencies(sr=self.sample_rate, n_fft=self.frame_length).astype(np.float32)
+        self._n_bins = self._fft_freqs.shape[0]
+        
+        # Reusable intermediate buffers, one per use site (not thread-safe)
+        self._scratch: Dict[str, np.ndarray] = {}
+        
+        # Run the STFT/iSTFT on the GPU when torch has CUDA
+        self._use_torch = (config.get('use_gpu', True) and torch is not None
+                           and torch.cuda.is_available())
+        if self._use_torch:
+            self._device = torch.device('cuda')
+            self._torch_window = torch.hann_window(self.frame_length, device=self._device)
+            
+            # Optionally specialise the transforms on this frame/hop length
+            self._torch_stft = self._torch_stft_impl
+            self._torch_istft = self._torch_istft_impl
+            if config.get('torch_compile', False) and hasattr(torch, 'compile'):
+                self._torch_stft = torch.compile(self._torch_stft_impl, dynamic=False)
+                self._torch_istft = torch.compile(self._torch_istft_impl, dynamic=False)
+        
     def process_spectrum(self, audio: np.ndarray, effects: Optional[Dict] = None) -> np.ndarray:
         """
         Process audio spectrum with advanced effects.
@@ -30,19 +118,97 @@ class SpectralProcessor:
         """
         try:
             # Compute STFT
-            D = librosa.stft(audio, n_fft=self.frame_length, hop_length=self.hop_length)
+            D = self._stft(audio)
             
             # Apply effects
             if effects:
                 D = self._apply_spectral_effects(D, effects)
             
             # Inverse STFT
-            return librosa.istft(D, hop_length=self.hop_length)
+            return self._istft(D, len(audio))
             
         except Exception as e:
             self.logger.error(f"Error processing spectrum: {str(e)}")
             raise
             
+    def process_spectrum_with_noise_gate(self, audio: np.ndarray,
+                                         noise_profile: Optional[np.ndarray] = None,
+                                         prop_decrease: float = 1.0,
+                                         effects: Optional[Dict] = None) -> np.ndarray:
+        """
+        Spectral-subtraction noise reduction and spectral effects on a single STFT.
+        
+        Args:
+            audio: Input audio signal
+            noise_profile: Per-bin noise magnitude of shape (1 + frame_length // 2,);
+                estimated from the quietest frames when omitted
+            prop_decrease: Fraction of the noise magnitude to subtract
+            effects: Optional dictionary of spectral effects to apply afterwards
+            
+        Returns:
+            Processed audio signal
+        """
+        try:
+            D = self._stft(audio)
+            magnitude = np.abs(D)
+            
+            if noise_profile is None:
+                # Mean spectrum of the quietest 10% of frames
+                energy = magnitude.sum(axis=0)
+                n_quiet = max(1, magnitude.shape[1] // 10)
+                quiet = np.argpartition(energy, n_quiet - 1)[:n_quiet]
+                noise_profile = magnitude[:, quiet].mean(axis=1)
+            noise = np.asarray(noise_profile, dtype=magnitude.dtype)[:, np.newaxis]
+            
+            # Soft mask: remove prop_decrease of the noise floor from each bin
+            mask = np.maximum(magnitude, 1e-10, out=magnitude)
+            np.divide(noise, mask, out=mask)
+            mask *= -prop_decrease
+            mask += 1.0
+            np.maximum(mask, 0.0, out=mask)
+            D *= mask
+            
+            if effects:
+                D = self._apply_spectral_effects(D, effects)
+            
+            return self._istft(D, len(audio))
+            
+        except Exception as e:
+            self.logger.error(f"Error processing spectrum with noise gate: {str(e)}")
+            raise
+            
+    def _stft(self, audio: np.ndarray) -> np.ndarray:
+        """Complex STFT of audio as a (bins, frames) array."""
+        if self._use_torch:
+            x = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32)).to(self._device)
+            return self._torch_stft(x).cpu().numpy()
+        return stft_real(audio, n_fft=self.frame_length, hop_length=self.hop_length)
+        
+    def _istft(self, D: np.ndarray, length: int) -> np.ndarray:
+        """Inverse of _stft, trimmed or padded to length samples."""
+        if self._use_torch:
+            spec = torch.from_numpy(np.ascontiguousarray(D, dtype=np.complex64)).to(self._device)
+            return self._torch_istft(spec, length).cpu().numpy()
+        return istft_real(D, hop_length=self.hop_length, length=length)
+        
+    def _scratch_like(self, arr: np.ndarray, name: str) -> np.ndarray:
+        """Uninitialised buffer shaped like arr, reused while the shape holds."""
+        buf = self._scratch.get(name)
+        if buf is None or buf.shape != arr.shape or buf.dtype != arr.dtype:
+            buf = self._scratch[name] = np.empty_like(arr)
+        return buf
+        
+    def _torch_stft_impl(self, x: 'torch.Tensor') -> 'torch.Tensor':
+        """torch.stft with this processor's frame, hop and window."""
+        return torch.stft(x, n_fft=self.frame_length, hop_length=self.hop_length,
+                          window=self._torch_window, center=True, pad_mode='constant',
+                          return_complex=True)
+        
+    def _torch_istft_impl(self, spec: 'torch.Tensor', length: int) -> 'torch.Tensor':
+        """torch.istft with this processor's frame, hop and window."""
+        return torch.istft(spec, n_fft=self.frame_length, hop_length=self.hop_length,
+                           window=self._torch_window, center=True, length=length)
+        
     def _apply_spectral_effects(self, D: np.ndarray, effects: Dict) -> np.ndarray:
         """Apply multiple spectral effects in sequence."""
         if effects.get('spectral_shaping'):
@@ -75,21 +241,17 @@ class SpectralProcessor:
             {'freq_low': 12000, 'freq_high': 20000, 'gain': 1.0}
         ])
         
-        # Convert frequencies to bin indices
-        freqs = librosa.fft_frequencies(sr=self.sample_rate, n_fft=self.frame_length)
-        
-        # Create shaping mask
-        mask = np.ones_like(D, dtype=float)
-        
-        for band in bands:
-            # Find bin indices for this band
-            idx_low = np.searchsorted(freqs, band['freq_low'])
-            idx_high = np.searchsorted(freqs, band['freq_high'])
+        # Unity bands are a no-op; skip the pass entirely when every band is flat
+        key = tuple((band['freq_low'], band['freq_high'], band['gain'])
+                    for band in bands if band['gain'] != 1.0)
+        if not key:
+            return D
             
-            # Apply gain
-            mask[idx_low:idx_high] *= band['gain'] ** shape_factor
-            
-        return D * mask
+        # One gain per frequency bin, broadcast over frames
+        gains = _band_gain_vector(self.sample_rate, self.frame_length, key, float(shape_factor))
+        
+        D *= gains[:, np.newaxis]
+        return D
         
     def _enhance_harmonics(self, D: np.ndarray, params: Dict) -> np.ndarray:
         """Enhance harmonic content while preserving phase."""
@@ -103,31 +265,27 @@ class SpectralProcessor:
         # Find harmonic peaks
         peaks = self._find_harmonic_peaks(magnitude, threshold)
         
-        # Enhance harmonics
-        magnitude_enhanced = magnitude.copy()
-        for peak in peaks:
-            magnitude_enhanced[peak] *= enhancement
+        # Enhance harmonics (magnitude is already a fresh array)
+        magnitude[peaks] *= enhancement
             
         # Reconstruct
-        return magnitude_enhanced * np.exp(1j * phase)
+        return magnitude * np.exp(1j * phase)
         
     def _apply_noise_gate(self, D: np.ndarray, params: Dict) -> np.ndarray:
         """Apply spectral noise gate."""
         threshold = params.get('threshold', -60)
         ratio = params.get('ratio', 10.0)
         
-        # Convert to dB
-        magnitude_db = librosa.amplitude_to_db(np.abs(D))
+        # Gain (dB) is min(level - threshold, 0) * (1 - 1/ratio), converted
+        # back to linear with a single exp
+        gain = _amplitude_to_db(np.abs(D))
+        gain -= threshold
+        np.minimum(gain, 0.0, out=gain)
+        gain *= (1 - 1/ratio) * _NEPER_PER_DB
+        np.exp(gain, out=gain)
         
-        # Calculate gain reduction
-        gain_reduction = np.zeros_like(magnitude_db)
-        mask = magnitude_db < threshold
-        gain_reduction[mask] = (threshold - magnitude_db[mask]) * (1 - 1/ratio)
-        
-        # Convert back to linear
-        gain = librosa.db_to_amplitude(-gain_reduction)
-        
-        return D * gain
+        D *= gain
+        return D
         
     def _apply_spectral_compression(self, D: np.ndarray, params: Dict) -> np.ndarray:
         """Apply compression in the spectral domain."""
@@ -136,13 +294,11 @@ class SpectralProcessor:
         attack = params.get('attack', 0.003)
         release = params.get('release', 0.25)
         
-        # Convert to dB
-        magnitude_db = librosa.amplitude_to_db(np.abs(D))
-        
-        # Calculate gain reduction
-        gain_reduction = np.zeros_like(magnitude_db)
-        mask = magnitude_db > threshold
-        gain_reduction[mask] = (magnitude_db[mask] - threshold) * (1 - 1/ratio)
+        # Calculate gain reduction: max(level - threshold, 0) * (1 - 1/ratio)
+        gain_reduction = _amplitude_to_db(np.abs(D))
+        gain_reduction -= threshold
+        np.maximum(gain_reduction, 0.0, out=gain_reduction)
+        gain_reduction *= 1 - 1/ratio
         
         # Smooth gain reduction
         gain_reduction = self._smooth_gain_reduction(
@@ -151,15 +307,22 @@ class SpectralProcessor:
             int(release * self.sample_rate / self.hop_length)
         )
         
-        # Convert back to linear
-        gain = librosa.db_to_amplitude(-gain_reduction)
+        # Convert back to linear in place
+        gain_reduction *= -_NEPER_PER_DB
+        gain = np.exp(gain_reduction, out=gain_reduction)
         
-        return D * gain
+        D *= gain
+        return D
         
     def _correct_phase(self, D: np.ndarray, params: Dict) -> np.ndarray:
         """Apply phase correction to improve coherence."""
         coherence = params.get('coherence', 0.5)
         
+        # A one-tap moving average leaves the unwrapped differences as they
+        # are, so the rebuilt phase equals the original modulo 2*pi
+        if int(1 / coherence) <= 1:
+            return D
+        
         # Get magnitude and phase
         magnitude = np.abs(D)
         phase = np.angle(D)
@@ -167,45 +330,69 @@ class SpectralProcessor:
         # Calculate phase differences
         phase_diff = np.diff(phase, axis=1)
         
-        # Smooth phase differences
-        phase_diff_smooth = np.zeros_like(phase_diff)
-        for i in range(phase_diff.shape[0]):
-            phase_diff_smooth[i] = self._smooth_phase(phase_diff[i], coherence)
+        # Smooth phase differences of every bin at once
+        phase_diff_smooth = self._smooth_phase(phase_diff, coherence)
             
-        # Reconstruct phase
-        phase_corrected = np.zeros_like(phase)
+        # Reconstruct phase by accumulating the smoothed differences
+        phase_corrected = self._scratch_like(phase, 'phase_corrected')
         phase_corrected[:, 0] = phase[:, 0]
-        for i in range(1, phase.shape[1]):
-            phase_corrected[:, i] = phase_corrected[:, i-1] + phase_diff_smooth[:, i-1]
+        np.cumsum(phase_diff_smooth, axis=1, out=phase_corrected[:, 1:])
+        phase_corrected[:, 1:] += phase[:, :1]
             
         # Reconstruct
         return magnitude * np.exp(1j * phase_corrected)
         
-    def _find_harmonic_peaks(self, magnitude: np.ndarray, threshold: float) -> List[int]:
-        """Find harmonic peaks in the magnitude spectrum."""
-        peaks = []
+    def _spectral_features(self, magnitude: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Per-frame centroid, rolloff (85%), flatness and bandwidth, matching
+        the librosa.feature defaults but sharing the per-frame sums.
+        
+        Args:
+            magnitude: Magnitude spectrogram (bins x frames)
+            
+        Returns:
+            Tuple of (centroid, rolloff, flatness, bandwidth) arrays
+        """
+        freqs = self._fft_freqs[:, np.newaxis]
+        
+        # Cumulative energy gives both the per-frame total and the rolloff bin
+        cumulative = np.cumsum(magnitude, axis=0)
+        total = cumulative[-1]
+        safe_total = np.where(total > 0, total, 1.0)
+        
+        centroid = (freqs * magnitude).sum(axis=0) / safe_total
+        bandwidth = np.sqrt((np.square(freqs - centroid) * magnitude).sum(axis=0) / safe_total)
+        
+        rolloff_bin = np.argmax(cumulative >= 0.85 * total, axis=0)
+        rolloff = self._fft_freqs[rolloff_bin]
+        
+        power = np.maximum(np.square(magnitude), 1e-10)
+        flatness = np.exp(np.log(power).mean(axis=0)) / power.mean(axis=0)
+        
+        return centroid, rolloff, flatness, bandwidth
+        
+    def _find_harmonic_peaks(self, magnitude: np.ndarray, threshold: float) -> np.ndarray:
+        """Find harmonic peaks (bin indices) in the magnitude spectrum."""
+        # Spectrograms are averaged over time first
+        m = magnitude if magnitude.ndim == 1 else magnitude.mean(axis=1)
         
         # Find local maxima
-        for i in range(1, magnitude.shape[0]-1):
-            if (magnitude[i] > magnitude[i-1] and 
-                magnitude[i] > magnitude[i+1] and 
-                magnitude[i] > threshold):
-                peaks.append(i)
-                
-        return peaks
+        mask = (m[1:-1] > m[:-2]) & (m[1:-1] > m[2:]) & (m[1:-1] > threshold)
+        return np.flatnonzero(mask) + 1
         
     def _smooth_phase(self, phase: np.ndarray, coherence: float) -> np.ndarray:
-        """Smooth phase differences."""
+        """Smooth phase differences along the last (time) axis."""
         # Unwrap phase
-        phase_unwrapped = np.unwrap(phase)
+        phase_unwrapped = np.unwrap(phase, axis=-1)
         
-        # Apply moving average
+        # Apply moving average (zero-padded at the edges)
         window_size = int(1 / coherence)
         if window_size > 1:
-            phase_smooth = np.convolve(
+            phase_smooth = uniform_filter1d(
                 phase_unwrapped,
-                np.ones(window_size) / window_size,
-                mode='same'
+                size=window_size,
+                axis=-1,
+                mode='constant'
             )
         else:
             phase_smooth = phase_unwrapped
@@ -213,35 +400,35 @@ class SpectralProcessor:
         return phase_smooth
         
     def _smooth_gain_reduction(self, gain_reduction: np.ndarray, attack: int, release: int) -> np.ndarray:
-        """Smooth gain reduction with attack and release."""
-        smoothed = np.zeros_like(gain_reduction)
-        current_gain = gain_reduction[0]
-        
-        for i in range(len(gain_reduction)):
-            if gain_reduction[i] > current_gain:
-                # Attack phase
-                current_gain += (gain_reduction[i] - current_gain) / attack
-            else:
-                # Release phase
-                current_gain += (gain_reduction[i] - current_gain) / release
-            smoothed[i] = current_gain
+        """Smooth gain reduction (bins x frames) along time with attack and release."""
+        gain_reduction = np.ascontiguousarray(gain_reduction)
+        
+        # Equal attack and release is a plain one-pole lowpass, started at the first frame
+        if max(attack, 1) == max(release, 1):
+            alpha = 1.0 / max(attack, 1)
+            smoothed, _ = signal.lfilter([alpha], [1.0, alpha - 1.0], gain_reduction, axis=1,
+                                         zi=(1.0 - alpha) * gain_reduction[:, :1])
+            return smoothed.astype(gain_reduction.dtype, copy=False)
             
-        return smoothed
+        return _smooth_gain_reduction_nb(
+            gain_reduction,
+            1.0 / max(attack, 1),
+            1.0 / max(release, 1),
+            self._scratch_like(gain_reduction, 'gain_smoothed')
+        )
         
     def analyze_spectrum(self, audio: np.ndarray) -> Dict:
         """Analyze spectral characteristics."""
         try:
             # Compute STFT
-            D = librosa.stft(audio, n_fft=self.frame_length, hop_length=self.hop_length)
+            D = self._stft(audio)
             
             # Get magnitude spectrum
             magnitude = np.abs(D)
             
             # Compute spectral features
-            spectral_centroid = librosa.feature.spectral_centroid(S=magnitude)[0]
-            spectral_rolloff = librosa.feature.spectral_rolloff(S=magnitude)[0]
-            spectral_flatness = librosa.feature.spectral_flatness(S=magnitude)[0]
-            spectral_bandwidth = librosa.feature.spectral_bandwidth(S=magnitude)[0]
+            spectral_centroid, spectral_rolloff, spectral_flatness, spectral_bandwidth = \
+                self._spectral_features(magnitude)
             
             # Compute harmonic features
             harmonic_peaks = self._find_harmonic_peaks(magnitude.mean(axis=1), 0.1)
@@ -253,7 +440,7 @@ class SpectralProcessor:
                 'spectral_flatness_mean': np.mean(spectral_flatness),
                 'spectral_bandwidth_mean': np.mean(spectral_bandwidth),
                 'harmonic_energy': harmonic_energy,
-                'harmonic_peaks': harmonic_peaks
+                'harmonic_peaks': harmonic_peaks.tolist()
             }
             
         except Exception as e:
@@ -0,0 +1,124 @@
+import logging
+import numpy as np
+from scipy import fft
+from scipy.signal import get_window
+from functools import lru_cache
+from typing import Dict, Optional
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+try:
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft
+except ImportError:
+    pyfftw = None
+
+_fftw_enabled = False
+
+def enable_fftw() -> bool:
+    """
+    Route scipy.fft through FFTW with plan caching, if pyfftw is installed.
+
+    Returns:
+        True if FFTW is now the active backend
+    """
+    global _fftw_enabled
+    if pyfftw is None:
+        return False
+    if not _fftw_enabled:
+        pyfftw.interfaces.cache.enable()
+        pyfftw.interfaces.cache.set_keepalive_time(30)
+        fft.set_global_backend(pyfftw.interfaces.scipy_fft)
+        _fftw_enabled = True
+    return True
+
+def configure_fft_backend(config: Dict, logger: logging.Logger) -> None:
+    """
+    Apply the use_fftw config option, warning when pyfftw is missing.
+
+    Args:
+        config: Processor configuration
+        logger: Logger of the processor being configured
+    """
+    if config.get('use_fftw', False) and not enable_fftw():
+        logger.warning("use_fftw is set but pyfftw is not installed; using scipy.fft")
+
+@lru_cache(maxsize=8)
+def time_axis(n: int, sample_rate: int) -> np.ndarray:
+    """Float32 time axis (seconds) for an n-sample signal, shared read-only between calls."""
+    t = np.arange(n, dtype=np.float32) / sample_rate
+    t.setflags(write=False)
+    return t
+
+@lru_cache(maxsize=8)
+def hann_window(n_fft: int) -> np.ndarray:
+    """Periodic Hann window, shared read-only between calls."""
+    window = get_window('hann', n_fft, fftbins=True).astype(np.float32)
+    window.setflags(write=False)
+    return window
+
+def _overlap_add(frames: np.ndarray, window_sq: np.ndarray, hop_length: int,
+                 out: np.ndarray, envelope: np.ndarray) -> None:
+    """Overlap-add frames into out and accumulate the squared-window envelope."""
+    n_fft = frames.shape[1]
+    for i in range(frames.shape[0]):
+        start = i * hop_length
+        out[start:start + n_fft] += frames[i]
+        envelope[start:start + n_fft] += window_sq
+
+if njit is not None:
+    _overlap_add = njit(cache=True)(_overlap_add)
+
+def stft_real(audio: np.ndarray, n_fft: int = 2048, hop_length: int = 512) -> np.ndarray:
+    """
+    Centered STFT of a real signal using a one-sided FFT.
+
+    Args:
+        audio: Mono audio signal
+        n_fft: FFT size
+        hop_length: Samples between frames
+
+    Returns:
+        Complex spectrogram of shape (1 + n_fft // 2, n_frames)
+    """
+    padded = np.pad(audio, n_fft // 2)
+    if len(padded) < n_fft:
+        padded = np.pad(padded, (0, n_fft - len(padded)))
+
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::hop_length]
+    return fft.rfft(frames * hann_window(n_fft), n=n_fft, axis=-1, workers=-1).T
+
+def istft_real(D: np.ndarray, hop_length: int = 512, length: Optional[int] = None) -> np.ndarray:
+    """
+    Inverse of stft_real using a one-sided inverse FFT and overlap-add.
+
+    Args:
+        D: Complex spectrogram of shape (1 + n_fft // 2, n_frames)
+        hop_length: Samples between frames
+        length: Optional exact output length
+
+    Returns:
+        Reconstructed audio signal
+    """
+    n_fft = 2 * (D.shape[0] - 1)
+    window = hann_window(n_fft)
+    frames = fft.irfft(D.T, n=n_fft, axis=-1, workers=-1)
+    frames *= window
+
+    n_frames = frames.shape[0]
+    out = np.zeros(n_fft + hop_length * (n_frames - 1), dtype=frames.dtype)
+    envelope = np.zeros_like(out)
+    _overlap_add(np.ascontiguousarray(frames), window * window, hop_length, out, envelope)
+
+    nonzero = envelope > 1e-8
+    out[nonzero] /= envelope[nonzero]
+
+    # Drop the centering pad
+    start = n_fft // 2
+    if length is None:
+        return out[start:len(out) - start]
+    out = out[start:start + length]
+    if len(out) < length:
+        out = np.pad(out, (0, length - len(out)))
+    return out
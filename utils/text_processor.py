@@ -1,8 +1,243 @@
+import os
 import re
-from typing import Dict, List, Optional
+from itertools import accumulate, repeat
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+import numpy as np
 import langdetect
 from langdetect import detect
 import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+try:
+    import pcre2
+except ImportError:
+    pcre2 = None
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _compile(pattern: str):
+    """Compile with JIT-enabled PCRE2 when installed, else the stdlib re module."""
+    if pcre2 is not None:
+        try:
+            return pcre2.compile(pattern, jit=True)
+        except pcre2.LibraryError:
+            pass
+    return re.compile(pattern)
+
+# Python's \s for str patterns (exactly the str.isspace characters), spelled
+# out because PCRE2's \s omits U+001C-U+001F and adds U+180E
+_SPACE = '\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000'
+_SPACE_NOT_BLANK = _SPACE.replace(' ', '')
+
+# Patterns used on every call, compiled once at import. _RE_WS matches only
+# whitespace runs that are not already a single space; every cleanup pattern
+# after it can then match literal single spaces, which lets the regex engine
+# skip ahead instead of trying a \s* match at every position.
+_RE_WS = _compile(f'[{_SPACE_NOT_BLANK}][{_SPACE}]*| [{_SPACE}]+')
+_RE_PUNCT_SPACE = _compile(r' ([.,!?])')
+_RE_DUP_PUNCT = _compile(r'([.,!?])[.,!?]')
+_RE_QUOTES = _compile(r' ["\'] ?|["\'] ?')
+_RE_LPAREN = _compile(r'\( ')
+_RE_RPAREN = _compile(r' \)')
+_RE_SENT_SPLIT = _compile(f'(?<=[.!?])[{_SPACE}]+')
+
+# Without PCRE2 the stdlib lookbehind is slower on prose than a plain scan
+_SCAN_SENTENCES = isinstance(_RE_SENT_SPLIT, re.Pattern)
+_SENTENCE_END = str.maketrans('!?', '..')
+
+def _split_sentences(paragraph: str) -> List[str]:
+    """Split after '.', '!' or '?' followed by whitespace, like _RE_SENT_SPLIT."""
+    sentences = []
+    start = 0
+    end = -1
+    # Every terminator becomes '.', so each piece after the first follows one
+    for piece in paragraph.translate(_SENTENCE_END).split('.'):
+        if end >= 0 and piece[:1].isspace():
+            sentences.append(paragraph[start:end + 1])
+            start = end + 1 + len(piece) - len(piece.lstrip())
+        end += len(piece) + 1
+    sentences.append(paragraph[start:])
+    return sentences
+
+# Texts longer than this are cleaned by the compiled byte scanner when numba is installed
+_NATIVE_CLEAN_MIN_CHARS = 50_000
+
+def _space_width(buf: np.ndarray, i: int, n: int) -> int:
+    """Byte length of the UTF-8 whitespace character at buf[i] (str.isspace), or 0."""
+    b = buf[i]
+    if b == 32 or 9 <= b <= 13 or 28 <= b <= 31:
+        return 1
+    if b == 0xC2 and i + 1 < n:
+        if buf[i + 1] == 0x85 or buf[i + 1] == 0xA0:
+            return 2
+    elif 0xE1 <= b <= 0xE3 and i + 2 < n:
+        b1 = buf[i + 1]
+        b2 = buf[i + 2]
+        if b == 0xE1 and b1 == 0x9A and b2 == 0x80:
+            return 3
+        if b == 0xE2 and b1 == 0x80 and (b2 <= 0x8A or b2 == 0xA8 or b2 == 0xA9 or b2 == 0xAF):
+            return 3
+        if b == 0xE2 and b1 == 0x81 and b2 == 0x9F:
+            return 3
+        if b == 0xE3 and b1 == 0x80 and b2 == 0x80:
+            return 3
+    return 0
+
+def _is_punct(b: int) -> bool:
+    """True for '.', ',', '!' or '?'."""
+    return b == 46 or b == 44 or b == 33 or b == 63
+
+def _clean_u8(buf: np.ndarray, out: np.ndarray) -> Tuple[int, int]:
+    """
+    The _clean_text cascade over UTF-8 bytes, one pass per rule. out must be
+    at least as long as buf (cleaning never grows the text); the cleaned
+    bytes are written to out[start:end] and (start, end) is returned.
+    """
+    tmp = np.empty_like(out)
+    n = buf.shape[0]
+    
+    # Whitespace runs -> single space
+    m = 0
+    i = 0
+    in_space = False
+    while i < n:
+        b = buf[i]
+        w = 0 if 32 < b < 0x80 else _space_width(buf, i, n)
+        if w == 0:
+            out[m] = b
+            m += 1
+            i += 1
+            in_space = False
+        else:
+            if not in_space:
+                out[m] = 32
+                m += 1
+            in_space = True
+            i += w
+            
+    # Space before punctuation
+    n = m
+    m = 0
+    for i in range(n):
+        if not (out[i] == 32 and i + 1 < n and _is_punct(out[i + 1])):
+            tmp[m] = out[i]
+            m += 1
+            
+    # Duplicate punctuation, consumed in pairs like the regex
+    n = m
+    m = 0
+    i = 0
+    while i < n:
+        out[m] = tmp[i]
+        m += 1
+        i += 2 if _is_punct(tmp[i]) and i + 1 < n and _is_punct(tmp[i + 1]) else 1
+        
+    # Spacing around quotes: ' ["\'] ?' or '["\'] ?' -> '"'
+    n = m
+    m = 0
+    i = 0
+    while i < n:
+        b = out[i]
+        if b == 32 and i + 1 < n and (out[i + 1] == 34 or out[i + 1] == 39):
+            i += 1
+            b = out[i]
+        if b == 34 or b == 39:
+            tmp[m] = 34
+            i += 2 if i + 1 < n and out[i + 1] == 32 else 1
+        else:
+            tmp[m] = b
+            i += 1
+        m += 1
+        
+    # Space after '(' or before ')'; whitespace is single spaces by now
+    n = m
+    m = 0
+    for i in range(n):
+        b = tmp[i]
+        if b == 32 and ((i > 0 and tmp[i - 1] == 40) or (i + 1 < n and tmp[i + 1] == 41)):
+            continue
+        out[m] = b
+        m += 1
+        
+    # Strip
+    start = 0
+    while start < m and out[start] == 32:
+        start += 1
+    while m > start and out[m - 1] == 32:
+        m -= 1
+    return start, m
+
+if njit is not None:
+    _space_width = njit(cache=True)(_space_width)
+    _is_punct = njit(cache=True)(_is_punct)
+    _clean_u8 = njit(cache=True)(_clean_u8)
+
+# Documents at least this long have their SSML body built across worker processes
+_PARALLEL_SSML_MIN_CHARS = 1 << 20
+
+def _punctuation_pauses(text: str, punct_break: str) -> str:
+    """Insert punct_break in place of commas, semicolons and colons."""
+    return text.replace(',', punct_break).replace(';', punct_break).replace(':', punct_break)
+
+def _ssml_body(text: str, punct_break: str, sent_break: str, para_break: str) -> str:
+    """SSML body for text: punctuation, sentence and paragraph pauses."""
+    # Break tags contain no sentence or paragraph delimiters, so
+    # punctuation pauses can be added to the whole text up front
+    text = _punctuation_pauses(text, punct_break)
+    if _SCAN_SENTENCES:
+        return para_break.join(
+            sent_break.join(_split_sentences(paragraph))
+            for paragraph in text.split('\n\n')
+        )
+    return para_break.join(
+        _RE_SENT_SPLIT.sub(sent_break, paragraph)
+        for paragraph in text.split('\n\n')
+    )
+
+# Split points tried, in order, for paragraphs longer than a chunk
+_CHUNK_SEPARATORS = ('\n', '. ', '! ', '? ', ' ')
+
+# Trailing chunks shorter than this are merged into the previous one if they fit
+_MIN_TRAILING_CHUNK = 100
+
+def _pack(parts: List[str], sep: str, max_size: int) -> List[str]:
+    """Greedily join consecutive parts (each at most max_size) into chunks of at most max_size."""
+    # prefix[j] - prefix[i] - len(sep) is the joined length of parts[i:j]
+    prefix = [0, *accumulate(len(part) + len(sep) for part in parts)]
+    chunks = []
+    start = 0
+    for end in range(1, len(parts) + 1):
+        if prefix[end] - prefix[start] - len(sep) > max_size:
+            chunks.append(sep.join(parts[start:end - 1]))
+            start = end - 1
+    chunks.append(sep.join(parts[start:]))
+    return chunks
+
+def _split_oversized(text: str, max_size: int, separators=_CHUNK_SEPARATORS) -> List[str]:
+    """Split text at the coarsest separator that occurs, recursing on pieces still too long."""
+    for i, sep in enumerate(separators):
+        if sep not in text:
+            continue
+        # Keep each separator at the end of the piece before it
+        pieces = text.split(sep)
+        pieces = [piece + sep for piece in pieces[:-1]] + [pieces[-1]]
+        parts = []
+        for piece in pieces:
+            if len(piece) > max_size:
+                parts.extend(_split_oversized(piece, max_size, separators[i + 1:]))
+            elif piece.strip():
+                parts.append(piece)
+        return _pack(parts, '', max_size)
+    
+    # No separator left: hard cut
+    return [text[i:i + max_size] for i in range(0, len(text), max_size)]
 
 class TextProcessor:
     """Advanced text processing utilities."""
@@ -18,6 +253,26 @@ class TextProcessor:
         self.paragraph_pause = config.get('paragraph_pause_duration', 2.0)
         self.text_cleanup = config.get('text_cleanup', True)
         self.language_detection = config.get('language_detection', True)
+        
+        # SSML break tags, formatted once
+        self._punct_break = f'<break time="{self.punctuation_pause}s"/>'
+        self._sent_break = f'<break time="{self.sentence_pause}s"/>'
+        self._para_break = f'<break time="{self.paragraph_pause}s"/>'
+        
+        # Opt-in worker processes for very long documents, started on first
+        # use and shut down by close(). Only pays off with text_cleanup off
+        # (cleanup collapses paragraph breaks) and several large documents,
+        # since starting the pool costs far more than one serial pass
+        self.ssml_workers = config.get('ssml_workers', 1)
+        self._pool = None
+        
+        # fastText language ID model, loaded on first detection
+        self.language_model_path = config.get('language_model_path', 'lid.176.ftz')
+        self._lid = None
+        self._lid_unavailable = False
+        
+        # Detection results keyed by the first 512 characters of the text
+        self._detect_cached = lru_cache(maxsize=1024)(self._detect_signature)
 
     def process_text(self, text: str, language: Optional[str] = None) -> str:
         """
@@ -46,29 +301,60 @@ class TextProcessor:
             return text
             
         except Exception as e:
-            self.logger.error(f"Error processing text: {str(e)}")
+            self.logger.error("Error processing text: %s", e)
             raise
 
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        if njit is not None and len(text) > _NATIVE_CLEAN_MIN_CHARS:
+            buf = np.frombuffer(text.encode('utf-8', 'surrogatepass'), dtype=np.uint8)
+            out = np.empty_like(buf)
+            start, end = _clean_u8(buf, out)
+            return out[start:end].tobytes().decode('utf-8', 'surrogatepass')
+            
+        # Remove extra whitespace (all later whitespace is single spaces)
+        text = _RE_WS.sub(' ', text)
         
         # Fix common punctuation issues
-        text = re.sub(r'\s+([.,!?])', r'\1', text)
-        text = re.sub(r'([.,!?])\s*([.,!?])', r'\1', text)
+        text = _RE_PUNCT_SPACE.sub(r'\1', text)
+        text = _RE_DUP_PUNCT.sub(r'\1', text)
         
         # Fix spacing around quotes
-        text = re.sub(r'\s*["\']\s*', '"', text)
+        text = _RE_QUOTES.sub('"', text)
         
         # Fix spacing around parentheses
-        text = re.sub(r'\(\s+', '(', text)
-        text = re.sub(r'\s+\)', ')', text)
+        text = _RE_LPAREN.sub('(', text)
+        text = _RE_RPAREN.sub(')', text)
         
         return text.strip()
 
+    def _load_language_model(self):
+        """Load the fastText language ID model once, if it is available."""
+        if self._lid is None and not self._lid_unavailable:
+            if fasttext is None or not os.path.exists(self.language_model_path):
+                self._lid_unavailable = True
+            else:
+                try:
+                    self._lid = fasttext.load_model(self.language_model_path)
+                except ValueError as e:
+                    self.logger.warning("Could not load language model, using langdetect: %s", e)
+                    self._lid_unavailable = True
+        return self._lid
+
     def _detect_language(self, text: str) -> str:
         """Detect text language."""
+        return self._detect_cached(text[:512])
+
+    def _detect_signature(self, text: str) -> str:
+        """Detect the language of a text signature (uncached)."""
+        lid = self._load_language_model()
+        if lid is not None and text.strip():
+            try:
+                labels, _ = lid.predict(text.replace('\n', ' '), k=1)
+                return labels[0].replace('__label__', '')
+            except Exception as e:
+                self.logger.warning("fastText language detection failed, using langdetect: %s", e)
+        
         try:
             return detect(text)
         except:
@@ -76,26 +362,11 @@ class TextProcessor:
 
     def _add_ssml(self, text: str, language: str) -> str:
         """Add SSML tags for better speech synthesis."""
-        # Split into paragraphs
-        paragraphs = text.split('\n\n')
-        processed_paragraphs = []
-        
-        for paragraph in paragraphs:
-            # Split into sentences
-            sentences = re.split(r'(?<=[.!?])\s+', paragraph)
-            processed_sentences = []
-            
-            for sentence in sentences:
-                # Add pauses for punctuation
-                sentence = self._add_punctuation_pauses(sentence)
-                processed_sentences.append(sentence)
-            
-            # Join sentences with appropriate pause
-            paragraph_text = f'<break time="{self.sentence_pause}s"/>'.join(processed_sentences)
-            processed_paragraphs.append(paragraph_text)
-        
-        # Join paragraphs with longer pause
-        text = f'<break time="{self.paragraph_pause}s"/>'.join(processed_paragraphs)
+        # Join sentences with a short pause and paragraphs with a longer one
+        if len(text) >= _PARALLEL_SSML_MIN_CHARS and self.ssml_workers > 1:
+            text = self._ssml_body_parallel(text)
+        else:
+            text = _ssml_body(text, self._punct_break, self._sent_break, self._para_break)
         
         # Wrap in SSML
         return f'''<speak version="1.1" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{language}">
@@ -104,39 +375,63 @@ class TextProcessor:
 
     def _add_punctuation_pauses(self, text: str) -> str:
         """Add SSML breaks for punctuation."""
-        # Add pauses for commas
-        text = re.sub(r',', f'<break time="{self.punctuation_pause}s"/>', text)
-        
-        # Add pauses for semicolons
-        text = re.sub(r';', f'<break time="{self.punctuation_pause}s"/>', text)
-        
-        # Add pauses for colons
-        text = re.sub(r':', f'<break time="{self.punctuation_pause}s"/>', text)
-        
-        return text
+        # Add pauses for commas, semicolons and colons
+        return _punctuation_pauses(text, self._punct_break)
+
+    def _ssml_body_parallel(self, text: str) -> str:
+        """
+        Build the SSML body of a long document in worker processes. The
+        regex engines hold the GIL, so threads would not run in parallel.
+        Paragraphs are independent, so contiguous blocks of them are
+        processed separately and joined with the paragraph pause.
+        """
+        paragraphs = text.split('\n\n')
+        if len(paragraphs) < 2:
+            return _ssml_body(text, self._punct_break, self._sent_break, self._para_break)
+            
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.ssml_workers,
+                                             mp_context=mp.get_context('spawn'))
+            
+        step = -(-len(paragraphs) // self.ssml_workers)
+        blocks = ['\n\n'.join(paragraphs[i:i + step]) for i in range(0, len(paragraphs), step)]
+        bodies = self._pool.map(_ssml_body, blocks, repeat(self._punct_break),
+                                repeat(self._sent_break), repeat(self._para_break))
+        return self._para_break.join(bodies)
+
+    def close(self) -> None:
+        """Shut down the SSML worker processes, if any were started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
 
     def split_into_chunks(self, text: str, max_chunk_size: int = 5000) -> List[str]:
         """Split text into manageable chunks for TTS processing."""
         if len(text) <= max_chunk_size:
             return [text]
         
-        # Split by paragraphs first
-        paragraphs = text.split('\n\n')
+        # Pack runs of paragraphs; paragraphs too long for one chunk are split on their own
         chunks = []
-        current_chunk = []
-        current_size = 0
-        
-        for paragraph in paragraphs:
-            if current_size + len(paragraph) > max_chunk_size:
-                if current_chunk:
-                    chunks.append('\n\n'.join(current_chunk))
-                current_chunk = [paragraph]
-                current_size = len(paragraph)
-            else:
-                current_chunk.append(paragraph)
-                current_size += len(paragraph)
+        run = []
+        for paragraph in text.split('\n\n'):
+            if not paragraph.strip():
+                continue
+            if len(paragraph) <= max_chunk_size:
+                run.append(paragraph)
+                continue
+            if run:
+                chunks.extend(_pack(run, '\n\n', max_chunk_size))
+                run = []
+            chunks.extend(_split_oversized(paragraph, max_chunk_size))
+        if run:
+            chunks.extend(_pack(run, '\n\n', max_chunk_size))
+        
+        # Engines reject empty text, so never hand them a blank chunk
+        chunks = [chunk for chunk in chunks if chunk.strip()]
         
-        if current_chunk:
-            chunks.append('\n\n'.join(current_chunk))
+        # Fold a tiny trailing chunk back into the previous one
+        if (len(chunks) > 1 and len(chunks[-1]) < _MIN_TRAILING_CHUNK
+                and len(chunks[-2]) + 2 + len(chunks[-1]) <= max_chunk_size):
+            chunks[-2:] = ['\n\n'.join(chunks[-2:])]
         
         return chunks 
\ No newline at end of file
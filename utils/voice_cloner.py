@@ -1,11 +1,22 @@
 import os
+import hashlib
+from collections import OrderedDict
 import torch
+import torchaudio
 import numpy as np
 from typing import Dict, Optional, List
 import soundfile as sf
 from TTS.api import TTS
 from tortoise.api import TextToSpeech
 import logging
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# Inputs the YourTTS ONNX export must take: token ids (1, T) int64 and the
+# speaker embedding (1, D) float32. Other exports fall back to Coqui TTS.
+_ONNX_INPUTS = frozenset({'text_ids', 'speaker_emb'})
 
 class VoiceCloner:
     """Voice cloning utilities."""
@@ -14,15 +25,51 @@ class VoiceCloner:
         self.config = config
         self.logger = logging.getLogger(__name__)
         
-        # Initialize TTS engines
-        self.coqui_tts = TTS(model_name="tts_models/multilingual/multi-dataset/your_tts",
-                            gpu=torch.cuda.is_available())
-        self.tortoise_tts = TextToSpeech()
+        # Opt-in tensor-core inference: fp16 autocast around synthesis
+        # (use_fp16), and TF32 matmuls with cuDNN autotuning (allow_tf32).
+        # The TF32/cuDNN flags are process-wide, so they also change numerics
+        # for any other torch code in the process.
+        self.use_fp16 = config.get('use_fp16', False) and torch.cuda.is_available()
+        if config.get('allow_tf32', False) and torch.cuda.is_available():
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+            torch.backends.cudnn.benchmark = True
+        
+        # TTS engines are loaded on first use (see coqui_tts / tortoise_tts)
+        self._coqui = None
+        self._tortoise = None
+        
+        # Optional pre-exported YourTTS ONNX model, loaded on first Coqui synthesis
+        self.onnx_model_path = config.get('onnx_model_path', 'models/yourtts.onnx')
+        self._onnx_session = None
+        self._onnx_unavailable = False
+        
+        # Pinned host buffer for copying generated audio off the GPU
+        self._host_buf = None
+        
+        # On-disk cache of Tortoise conditioning latents, one file per voice
+        self.latents_cache_dir = config.get('latents_cache_dir', 'cache')
         
-        # Voice storage
-        self.voice_samples = {}
+        # Voice storage, least recently used first; capped at max_voices
+        self.max_voices = max(1, config.get('max_cached_voices', 32))
+        self.voice_samples = OrderedDict()
         self.voice_embeddings = {}
 
+    @property
+    def coqui_tts(self) -> TTS:
+        """Coqui YourTTS model, loaded on first access."""
+        if self._coqui is None:
+            self._coqui = TTS(model_name="tts_models/multilingual/multi-dataset/your_tts",
+                              gpu=torch.cuda.is_available())
+        return self._coqui
+
+    @property
+    def tortoise_tts(self) -> TextToSpeech:
+        """Tortoise model, loaded on first access."""
+        if self._tortoise is None:
+            self._tortoise = TextToSpeech()
+        return self._tortoise
+
     def clone_voice(self, 
                    reference_audio: str, 
                    voice_name: str,
@@ -40,27 +87,35 @@ class VoiceCloner:
         """
         try:
             # Load and process reference audio
-            audio, sr = sf.read(reference_audio)
+            audio, sr = sf.read(reference_audio, dtype='float32')
             
             if engine.lower() == 'coqui':
-                # Clone using Coqui TTS
+                # Clone using Coqui TTS; the speaker embedding is computed once here
+                speaker_emb = self._register_coqui_speaker(reference_audio, voice_name)
                 self.voice_samples[voice_name] = {
                     'audio': audio,
+                    'reference_audio': reference_audio,
                     'sample_rate': sr,
-                    'engine': 'coqui'
+                    'engine': 'coqui',
+                    'voice_name': voice_name,
+                    'speaker_emb': speaker_emb
                 }
                 
             elif engine.lower() == 'tortoise':
-                # Clone using Tortoise TTS
+                # Clone using Tortoise TTS; conditioning latents are computed once here
                 self.voice_samples[voice_name] = {
                     'audio': audio,
                     'sample_rate': sr,
-                    'engine': 'tortoise'
+                    'engine': 'tortoise',
+                    'latents': self._get_tortoise_latents(voice_name, audio, sr)
                 }
                 
             else:
                 raise ValueError(f"Unsupported engine: {engine}")
             
+            self.voice_samples.move_to_end(voice_name)
+            self._evict_voices()
+            
             return {
                 'voice_name': voice_name,
                 'engine': engine,
@@ -69,7 +124,7 @@ class VoiceCloner:
             }
             
         except Exception as e:
-            self.logger.error(f"Error cloning voice: {str(e)}")
+            self.logger.error("Error cloning voice: %s", e)
             raise
 
     def synthesize_with_cloned_voice(self,
@@ -92,33 +147,189 @@ class VoiceCloner:
                 raise ValueError(f"Voice {voice_name} not found")
             
             voice_data = self.voice_samples[voice_name]
+            self.voice_samples.move_to_end(voice_name)
+            
+            with torch.inference_mode(), torch.autocast('cuda', dtype=torch.float16, enabled=self.use_fp16):
+                self._synthesize(voice_data, text, output_path)
+            
+            return output_path
+            
+        except Exception as e:
+            self.logger.error("Error synthesizing with cloned voice: %s", e)
+            raise
+
+    def synthesize_batch(self,
+                         texts: List[str],
+                         voice_name: str,
+                         output_paths: List[str]) -> List[str]:
+        """
+        Synthesize several texts with the same cloned voice.
+        
+        Args:
+            texts: Texts to synthesize
+            voice_name: Name of the cloned voice to use
+            output_paths: Paths to save the output audio, matching texts
+            
+        Returns:
+            Paths to the generated audio files
+        """
+        try:
+            if len(texts) != len(output_paths):
+                raise ValueError("texts and output_paths must have the same length")
+            if voice_name not in self.voice_samples:
+                raise ValueError(f"Voice {voice_name} not found")
+            
+            voice_data = self.voice_samples[voice_name]
+            self.voice_samples.move_to_end(voice_name)
+            
+            # One voice lookup and inference context for the whole batch
+            with torch.inference_mode(), torch.autocast('cuda', dtype=torch.float16, enabled=self.use_fp16):
+                for text, output_path in zip(texts, output_paths):
+                    self._synthesize(voice_data, text, output_path)
             
-            if voice_data['engine'] == 'coqui':
-                # Synthesize using Coqui TTS
+            return list(output_paths)
+            
+        except Exception as e:
+            self.logger.error("Error batch synthesizing with cloned voice: %s", e)
+            raise
+
+    def _synthesize(self, voice_data: Dict, text: str, output_path: str) -> None:
+        """Synthesize one text with a stored voice and write it to output_path."""
+        if voice_data['engine'] == 'coqui':
+            # Synthesize using the ONNX export when present, else Coqui TTS
+            session = self._build_onnx_session()
+            if session is not None:
+                self._synthesize_onnx(session, voice_data, text, output_path)
+            else:
+                # The voice is registered as a named speaker, so Coqui reuses
+                # its stored embedding instead of re-encoding speaker_wav
                 self.coqui_tts.tts_to_file(
                     text=text,
                     file_path=output_path,
-                    speaker_wav=voice_data['audio'],
+                    speaker=voice_data['voice_name'],
                     language='en'
                 )
-                
-            elif voice_data['engine'] == 'tortoise':
-                # Synthesize using Tortoise TTS
-                gen_audio = self.tortoise_tts.tts(
-                    text=text,
-                    voice_samples=voice_data['audio'],
-                    preset='fast'
-                )
-                
-                # Save audio
-                gen_audio = gen_audio.squeeze().cpu().numpy()
-                sf.write(output_path, gen_audio, 22050)
             
-            return output_path
+        elif voice_data['engine'] == 'tortoise':
+            # Synthesize using Tortoise TTS from the cached conditioning latents
+            gen_audio = self.tortoise_tts.tts_with_preset(
+                text,
+                preset='fast',
+                conditioning_latents=voice_data['latents']
+            )
             
-        except Exception as e:
-            self.logger.error(f"Error synthesizing with cloned voice: {str(e)}")
-            raise
+            # Save audio
+            sf.write(output_path, self._to_host(gen_audio), 22050)
+
+    def _register_coqui_speaker(self, reference_audio: str, voice_name: str) -> List[float]:
+        """
+        Compute a YourTTS speaker embedding for the reference audio and
+        register it with Coqui's speaker manager under voice_name.
+        
+        Args:
+            reference_audio: Path to reference audio file
+            voice_name: Speaker name to register the embedding as
+            
+        Returns:
+            The speaker embedding
+        """
+        manager = self.coqui_tts.synthesizer.tts_model.speaker_manager
+        speaker_emb = manager.compute_embedding_from_clip(reference_audio)
+        manager.embeddings_by_names[voice_name] = [speaker_emb]
+        return speaker_emb
+
+    def _build_onnx_session(self):
+        """Create the ONNX Runtime session for the YourTTS export once, if available."""
+        if self._onnx_session is None and not self._onnx_unavailable:
+            if ort is None or not os.path.exists(self.onnx_model_path):
+                self._onnx_unavailable = True
+            else:
+                available = ort.get_available_providers()
+                providers = [p for p in ('CUDAExecutionProvider', 'CPUExecutionProvider') if p in available]
+                try:
+                    session = ort.InferenceSession(self.onnx_model_path, providers=providers)
+                except Exception as e:
+                    # Corrupt export or provider/runtime mismatch; don't retry per call
+                    self.logger.warning("Could not load ONNX model %s, using Coqui TTS: %s",
+                                        self.onnx_model_path, e)
+                    self._onnx_unavailable = True
+                    return None
+                inputs = {node.name for node in session.get_inputs()}
+                if inputs == _ONNX_INPUTS:
+                    self._onnx_session = session
+                else:
+                    self.logger.warning("ONNX model %s takes inputs %s, expected %s; using Coqui TTS",
+                                        self.onnx_model_path, sorted(inputs), sorted(_ONNX_INPUTS))
+                    self._onnx_unavailable = True
+        return self._onnx_session
+
+    def _synthesize_onnx(self, session, voice_data: Dict, text: str, output_path: str) -> None:
+        """Run the exported YourTTS graph for one text and write the waveform."""
+        # Text tokenisation still comes from the Coqui model
+        synthesizer = self.coqui_tts.synthesizer
+        model = synthesizer.tts_model
+        text_ids = np.asarray(model.tokenizer.text_to_ids(text, language='en'), dtype=np.int64)
+        
+        wav = session.run(None, {
+            'text_ids': text_ids[np.newaxis, :],
+            'speaker_emb': np.asarray(voice_data['speaker_emb'], dtype=np.float32).reshape(1, -1)
+        })[0]
+        sf.write(output_path, np.asarray(wav, dtype=np.float32).reshape(-1), synthesizer.output_sample_rate)
+
+    def _to_host(self, audio: torch.Tensor) -> np.ndarray:
+        """
+        Flatten generated audio to a float32 numpy array. CUDA tensors are
+        copied into a reusable pinned host buffer that grows as needed.
+        """
+        audio = audio.reshape(-1)
+        if audio.device.type != 'cuda':
+            return audio.float().numpy()
+        
+        n = audio.numel()
+        if self._host_buf is None or self._host_buf.numel() < n:
+            self._host_buf = torch.empty(n, dtype=torch.float32, pin_memory=True)
+        host = self._host_buf[:n]
+        host.copy_(audio, non_blocking=True)
+        torch.cuda.current_stream(audio.device).synchronize()
+        return host.numpy()
+
+    def _get_tortoise_latents(self, voice_name: str, audio: np.ndarray, sr: int) -> tuple:
+        """
+        Load Tortoise conditioning latents for a voice from the disk cache, or
+        compute and cache them. Cache files are named by a hash of the voice
+        name and the reference audio, so neither can escape the cache directory.
+        
+        Args:
+            voice_name: Name of the voice
+            audio: Reference audio as float32, as loaded by soundfile
+            sr: Sample rate of audio
+            
+        Returns:
+            Tuple of (autoregressive, diffusion) conditioning latents
+        """
+        digest = hashlib.blake2b(voice_name.encode('utf-8'), digest_size=16)
+        digest.update(str(sr).encode('ascii'))
+        digest.update(np.ascontiguousarray(audio).tobytes())
+        cache_path = os.path.join(self.latents_cache_dir, f"{digest.hexdigest()}.pt")
+        
+        if os.path.exists(cache_path):
+            # Plain tensors only; never unpickle arbitrary objects from disk
+            return tuple(torch.load(cache_path, map_location='cpu', weights_only=True))
+        
+        # Tortoise expects mono (1, n) clips at 22.05 kHz
+        clip = torch.from_numpy(audio)
+        if clip.ndim > 1:
+            clip = clip.mean(dim=1)
+        if sr != 22050:
+            clip = torchaudio.functional.resample(clip, sr, 22050)
+        latents = self.tortoise_tts.get_conditioning_latents([clip.unsqueeze(0)])
+        latents = tuple(latent.cpu() for latent in latents)
+        
+        os.makedirs(self.latents_cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        torch.save(latents, tmp_path)
+        os.replace(tmp_path, cache_path)
+        return latents
 
     def get_cloned_voices(self) -> Dict[str, Dict]:
         """Get information about all cloned voices."""
@@ -134,6 +345,24 @@ class VoiceCloner:
     def delete_cloned_voice(self, voice_name: str) -> bool:
         """Delete a cloned voice."""
         if voice_name in self.voice_samples:
-            del self.voice_samples[voice_name]
+            self._drop_voice(voice_name)
             return True
-        return False 
\ No newline at end of file
+        return False
+
+    def _drop_voice(self, voice_name: str) -> None:
+        """Remove a voice and the speaker data registered for it."""
+        voice_data = self.voice_samples.pop(voice_name)
+        if voice_data['engine'] == 'coqui' and self._coqui is not None:
+            self._coqui.synthesizer.tts_model.speaker_manager.embeddings_by_names.pop(voice_name, None)
+        voice_data.clear()
+
+    def _evict_voices(self) -> None:
+        """Drop least recently used voices beyond max_voices."""
+        if len(self.voice_samples) <= self.max_voices:
+            return
+        while len(self.voice_samples) > self.max_voices:
+            voice_name = next(iter(self.voice_samples))
+            self.logger.info("Evicting cloned voice %s", voice_name)
+            self._drop_voice(voice_name)
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache() 
\ No newline at end of file